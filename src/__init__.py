@@ -1,38 +1,45 @@
 # Input: src.models enums and dataclasses
-# Output: package re-exports
+# Output: package re-exports (lazy via src._lazy)
 # Pos: src package initializer
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
 vibe-quant: Binance U 本位永续 Hedge 模式 Reduce-Only 小单平仓执行器
+
+导出名按需从 src.models 加载（首次访问后缓存到模块命名空间）。
 """
 
-from src.models import (
-    # 枚举
-    PositionSide,
-    OrderSide,
-    OrderType,
-    TimeInForce,
-    OrderStatus,
-    ExecutionMode,
-    ExecutionState,
-    SignalReason,
-    # 数据结构
-    MarketEvent,
-    MarketState,
-    Position,
-    PositionUpdate,
-    LeverageUpdate,
-    SymbolRules,
-    ExitSignal,
-    OrderIntent,
-    OrderResult,
-    OrderUpdate,
-    SideExecutionState,
-    RiskFlag,
-)
+from typing import TYPE_CHECKING
+
+from src._lazy import install
 
-__all__ = [
+if TYPE_CHECKING:
+    from src.models import (
+        # 枚举
+        PositionSide,
+        OrderSide,
+        OrderType,
+        TimeInForce,
+        OrderStatus,
+        ExecutionMode,
+        ExecutionState,
+        SignalReason,
+        # 数据结构
+        MarketEvent,
+        MarketState,
+        Position,
+        PositionUpdate,
+        LeverageUpdate,
+        SymbolRules,
+        ExitSignal,
+        OrderIntent,
+        OrderResult,
+        OrderUpdate,
+        SideExecutionState,
+        RiskFlag,
+    )
+
+__all__ = (
     # 枚举
     "PositionSide",
     "OrderSide",
@@ -55,4 +62,29 @@ __all__ = [
     "OrderUpdate",
     "SideExecutionState",
     "RiskFlag",
-]
+)
+
+install(globals(), {
+    # 枚举
+    "PositionSide": ("src.models", "PositionSide"),
+    "OrderSide": ("src.models", "OrderSide"),
+    "OrderType": ("src.models", "OrderType"),
+    "TimeInForce": ("src.models", "TimeInForce"),
+    "OrderStatus": ("src.models", "OrderStatus"),
+    "ExecutionMode": ("src.models", "ExecutionMode"),
+    "ExecutionState": ("src.models", "ExecutionState"),
+    "SignalReason": ("src.models", "SignalReason"),
+    # 数据结构
+    "MarketEvent": ("src.models", "MarketEvent"),
+    "MarketState": ("src.models", "MarketState"),
+    "Position": ("src.models", "Position"),
+    "PositionUpdate": ("src.models", "PositionUpdate"),
+    "LeverageUpdate": ("src.models", "LeverageUpdate"),
+    "SymbolRules": ("src.models", "SymbolRules"),
+    "ExitSignal": ("src.models", "ExitSignal"),
+    "OrderIntent": ("src.models", "OrderIntent"),
+    "OrderResult": ("src.models", "OrderResult"),
+    "OrderUpdate": ("src.models", "OrderUpdate"),
+    "SideExecutionState": ("src.models", "SideExecutionState"),
+    "RiskFlag": ("src.models", "RiskFlag"),
+})
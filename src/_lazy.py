@@ -0,0 +1,45 @@
+# Input: package globals() and export table (name -> (module, attr))
+# Output: install() that wires PEP 562 __getattr__/__dir__ (checks static __all__ against the table)
+# Pos: shared lazy-export helper for package initializers
+# 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
+
+"""
+包级惰性导出工具
+
+各子包 __init__.py 静态声明 __all__（供类型检查器识别导出名），并通过 install() 声明导出表；
+导出名在首次访问时才导入实现模块，结果写回包命名空间，后续访问直接命中模块 __dict__。
+"""
+
+from importlib import import_module
+from typing import Any, Dict, List, Mapping, Tuple
+
+
+def install(package_globals: Dict[str, Any], lazy_map: Mapping[str, Tuple[str, str]]) -> None:
+    """
+    为包安装惰性导出
+
+    Args:
+        package_globals: 包 __init__.py 的 globals()（须已声明 __all__）
+        lazy_map: 导出名 -> (模块路径, 属性名)
+
+    Raises:
+        ValueError: __all__ 与导出表不一致
+    """
+    package_name = package_globals["__name__"]
+    if set(package_globals.get("__all__", ())) != set(lazy_map):
+        raise ValueError(f"{package_name}: __all__ does not match lazy export table")
+
+    def __getattr__(name: str) -> Any:
+        spec = lazy_map.get(name)
+        if spec is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        module_path, attr = spec
+        value = getattr(import_module(module_path), attr)
+        package_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(lazy_map) | set(package_globals))
+
+    package_globals["__getattr__"] = __getattr__
+    package_globals["__dir__"] = __dir__
@@ -1,40 +1,45 @@
 # Input: config loader and models
-# Output: config exports
+# Output: config exports (lazy via src._lazy)
 # Pos: config package initializer
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
 配置模块
 
-导出：
+导出（按需加载，首次访问后缓存到模块命名空间）：
 - ConfigLoader: 配置加载器
 - AppConfig: 应用配置
 - MergedSymbolConfig: 合并后的 symbol 配置
 """
 
-from src.config.loader import ConfigLoader
-from src.config.models import (
-    AppConfig,
-    MergedSymbolConfig,
-    WSConfig,
-    ReconnectConfig,
-    ExecutionConfig,
-    AccelConfig,
-    AccelTier,
-    RoiConfig,
-    RoiTier,
-    RiskConfig,
-    RateLimitConfig,
-    TelegramConfig,
-    TelegramEventsConfig,
-    SymbolConfig,
-    SymbolExecutionConfig,
-    SymbolAccelConfig,
-    SymbolRoiConfig,
-    GlobalConfig,
-)
+from typing import TYPE_CHECKING
+
+from src._lazy import install
+
+if TYPE_CHECKING:
+    from src.config.loader import ConfigLoader
+    from src.config.models import (
+        AppConfig,
+        MergedSymbolConfig,
+        WSConfig,
+        ReconnectConfig,
+        ExecutionConfig,
+        AccelConfig,
+        AccelTier,
+        RoiConfig,
+        RoiTier,
+        RiskConfig,
+        RateLimitConfig,
+        TelegramConfig,
+        TelegramEventsConfig,
+        SymbolConfig,
+        SymbolExecutionConfig,
+        SymbolAccelConfig,
+        SymbolRoiConfig,
+        GlobalConfig,
+    )
 
-__all__ = [
+__all__ = (
     "ConfigLoader",
     "AppConfig",
     "MergedSymbolConfig",
@@ -54,4 +59,26 @@ __all__ = [
     "SymbolAccelConfig",
     "SymbolRoiConfig",
     "GlobalConfig",
-]
+)
+
+install(globals(), {
+    "ConfigLoader": ("src.config.loader", "ConfigLoader"),
+    "AppConfig": ("src.config.models", "AppConfig"),
+    "MergedSymbolConfig": ("src.config.models", "MergedSymbolConfig"),
+    "WSConfig": ("src.config.models", "WSConfig"),
+    "ReconnectConfig": ("src.config.models", "ReconnectConfig"),
+    "ExecutionConfig": ("src.config.models", "ExecutionConfig"),
+    "AccelConfig": ("src.config.models", "AccelConfig"),
+    "AccelTier": ("src.config.models", "AccelTier"),
+    "RoiConfig": ("src.config.models", "RoiConfig"),
+    "RoiTier": ("src.config.models", "RoiTier"),
+    "RiskConfig": ("src.config.models", "RiskConfig"),
+    "RateLimitConfig": ("src.config.models", "RateLimitConfig"),
+    "TelegramConfig": ("src.config.models", "TelegramConfig"),
+    "TelegramEventsConfig": ("src.config.models", "TelegramEventsConfig"),
+    "SymbolConfig": ("src.config.models", "SymbolConfig"),
+    "SymbolExecutionConfig": ("src.config.models", "SymbolExecutionConfig"),
+    "SymbolAccelConfig": ("src.config.models", "SymbolAccelConfig"),
+    "SymbolRoiConfig": ("src.config.models", "SymbolRoiConfig"),
+    "GlobalConfig": ("src.config.models", "GlobalConfig"),
+})
@@ -1,4 +1,4 @@
-# Input: YAML config path and env vars
+# Input: YAML config path and env vars (libyaml CSafeLoader when available)
 # Output: AppConfig and merged symbol config
 # Pos: config loader/merger
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
@@ -27,6 +27,12 @@ from typing import Optional
 
 import yaml
 
+# 优先使用 libyaml 的 C 实现（无 libyaml 时回退纯 Python SafeLoader）
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:  # pragma: no cover - 取决于 PyYAML 构建方式
+    from yaml import SafeLoader as _YamlSafeLoader
+
 from .models import (
     AppConfig,
     AccelTier,
@@ -68,7 +74,7 @@ class ConfigLoader:
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
         with open(self.config_path, "r", encoding="utf-8") as f:
-            raw_config = yaml.safe_load(f) or {}
+            raw_config = yaml.load(f, Loader=_YamlSafeLoader) or {}
 
         # 解析为 pydantic 模型
         self._config = AppConfig(**raw_config)
@@ -1,15 +1,26 @@
 # Input: ExchangeAdapter
-# Output: exchange exports
+# Output: exchange exports (lazy via src._lazy)
 # Pos: exchange package initializer
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
 交易所模块
 
-导出：
+导出（按需加载，避免 import 时拉起 ccxt/aiohttp）：
 - ExchangeAdapter: 交易所适配器
 """
 
-from src.exchange.adapter import ExchangeAdapter
+from typing import TYPE_CHECKING
 
-__all__ = ["ExchangeAdapter"]
+from src._lazy import install
+
+if TYPE_CHECKING:
+    from src.exchange.adapter import ExchangeAdapter
+
+__all__ = (
+    "ExchangeAdapter",
+)
+
+install(globals(), {
+    "ExchangeAdapter": ("src.exchange.adapter", "ExchangeAdapter"),
+})
@@ -1,15 +1,26 @@
 # Input: ExecutionEngine
-# Output: execution exports
+# Output: execution exports (lazy via src._lazy)
 # Pos: execution package initializer
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
 执行模块
 
-导出：
+导出（按需加载）：
 - ExecutionEngine: 执行引擎
 """
 
-from src.execution.engine import ExecutionEngine
+from typing import TYPE_CHECKING
 
-__all__ = ["ExecutionEngine"]
+from src._lazy import install
+
+if TYPE_CHECKING:
+    from src.execution.engine import ExecutionEngine
+
+__all__ = (
+    "ExecutionEngine",
+)
+
+install(globals(), {
+    "ExecutionEngine": ("src.execution.engine", "ExecutionEngine"),
+})
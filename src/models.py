@@ -1,6 +1,6 @@
 # Input: none
 # Output: shared enums and dataclasses for module contracts
-# Pos: core data contracts and event payloads
+# Pos: core data contracts and event payloads (hot-path dataclasses slotted)
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
@@ -82,7 +82,7 @@ class SignalReason(str, Enum):
 # 市场数据
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class MarketEvent:
     """
     市场数据事件（从 WS 接收）
@@ -101,7 +101,7 @@ class MarketEvent:
     event_type: Literal["book_ticker", "agg_trade", "mark_price"] = "book_ticker"
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketState:
     """
     某个 symbol 的市场状态（聚合后）
@@ -121,7 +121,7 @@ class MarketState:
 # 仓位数据
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """
     仓位信息（Hedge 模式）
@@ -186,7 +186,7 @@ class SymbolRules:
 # 信号
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class ExitSignal:
     """
     平仓信号（由 SignalEngine 产生）
@@ -1,15 +1,26 @@
 # Input: TelegramNotifier
-# Output: notify exports
+# Output: notify exports (lazy via src._lazy)
 # Pos: notify package initializer
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
 通知模块
 
-导出：
+导出（按需加载，避免 import 时拉起 aiohttp）：
 - TelegramNotifier: Telegram 通知器
 """
 
-from src.notify.telegram import TelegramNotifier
+from typing import TYPE_CHECKING
 
-__all__ = ["TelegramNotifier"]
+from src._lazy import install
+
+if TYPE_CHECKING:
+    from src.notify.telegram import TelegramNotifier
+
+__all__ = (
+    "TelegramNotifier",
+)
+
+install(globals(), {
+    "TelegramNotifier": ("src.notify.telegram", "TelegramNotifier"),
+})
@@ -1,5 +1,5 @@
 # Input: positions, rules, exchange adapter, external stop orders
-# Output: protective stop orders, takeover decisions, and state
+# Output: protective stop orders, takeover decisions, and state (orders normalized once per sync)
 # Pos: protective stop manager
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
@@ -19,6 +19,8 @@ from __future__ import annotations
 
 import asyncio
 import time
+import zlib
+from collections import defaultdict
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any, Dict, Optional, Sequence
@@ -39,7 +41,29 @@ from src.utils.helpers import round_to_tick, round_up_to_tick, symbol_to_ws_stre
 from src.utils.logger import log_event, log_error
 
 
-@dataclass
+# 视为止损/止盈条件单的订单类型（外部接管判断）
+_STOP_ORDER_TYPES = frozenset({"STOP_MARKET", "TAKE_PROFIT_MARKET", "STOP", "TAKE_PROFIT"})
+# 订单类型字段的查找顺序（order 顶层与 info 内相同）
+_ORDER_TYPE_KEYS = ("orderType", "type", "algoType")
+
+# Algo Order 终态
+_ALGO_TERMINAL_STATUSES = frozenset({"CANCELED", "FILLED", "TRIGGERED", "EXPIRED", "REJECTED", "FINISHED"})
+
+# clientOrderId 前缀中的 side_code
+_SIDE_BY_CODE = {"L": PositionSide.LONG, "S": PositionSide.SHORT}
+
+# startup 快照日志位掩码：bit0/1 = 自有止损 LONG/SHORT，bit2/3 = 外部止损 LONG/SHORT
+_STARTUP_LOGGED_OWN_BITS = {PositionSide.LONG: 1 << 0, PositionSide.SHORT: 1 << 1}
+_STARTUP_LOGGED_EXTERNAL_BITS = {PositionSide.LONG: 1 << 2, PositionSide.SHORT: 1 << 3}
+
+
+def _order_info(order: Dict[str, Any]) -> Dict[str, Any]:
+    """取订单的原始 info 字段（缺失或非 dict 时返回空 dict）。"""
+    info = order.get("info")
+    return info if isinstance(info, dict) else {}
+
+
+@dataclass(slots=True)
 class ProtectiveStopState:
     symbol: str
     position_side: PositionSide
@@ -48,6 +72,20 @@ class ProtectiveStopState:
     stop_price: Optional[Decimal] = None
 
 
+@dataclass(slots=True)
+class _NormalizedOrder:
+    """挂单字段一次性提取结果（openOrders/openAlgoOrders 统一口径）。"""
+
+    position_side: Optional[PositionSide]
+    client_order_id: Optional[str]
+    order_id: Optional[str]
+    stop_price: Optional[Decimal]
+    order_type: Optional[str]
+    close_position: Optional[bool]
+    reduce_only: Optional[bool]
+    working_type: Optional[str]
+
+
 class ProtectiveStopManager:
     """保护性止损管理器（按 symbol + positionSide 维护 1 张条件单）。"""
 
@@ -63,45 +101,68 @@ class ProtectiveStopManager:
         self._risk_stage = "protective_stop"
         self._risk_levels = dict(risk_levels or {})
         self._states: Dict[tuple[str, PositionSide], ProtectiveStopState] = {}
-        self._locks: Dict[str, asyncio.Lock] = {}
-        self._startup_existing_logged: set[tuple[str, PositionSide]] = set()
-        self._startup_existing_external_logged: set[tuple[str, PositionSide]] = set()
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # 每完成一次同步 +1：用于判断锁外拉取的挂单快照是否已过期
+        self._sync_generation: defaultdict[str, int] = defaultdict(int)
+        # startup 快照日志是否已输出（按 symbol 打包为位掩码，见 _STARTUP_LOGGED_* 常量）
+        self._startup_logged_bits: Dict[str, int] = {}
         self._external_multi_sig: Dict[tuple[str, PositionSide], tuple[str, ...]] = {}
+        # 上次计算的期望 stopPrice：(liquidation_price, dist_to_liq, tick_size) -> stopPrice
+        self._desired_stop_cache: Dict[
+            tuple[str, PositionSide], tuple[tuple[Decimal, Decimal, Decimal], Decimal]
+        ] = {}
+        # clientOrderId 前缀只取决于 symbol+side 与配置前缀，计算一次后常驻
+        self._prefix_cache: Dict[tuple[str, PositionSide], str] = {}
+        # 上次生成 clientOrderId 用的毫秒时间戳（同一毫秒内多次生成时递增，避免重复）
+        self._last_cid_ms = 0
 
     def _get_risk_level(self) -> Optional[int]:
         return self._risk_levels.get(self._risk_stage)
 
-    def _get_lock(self, symbol: str) -> asyncio.Lock:
-        lock = self._locks.get(symbol)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._locks[symbol] = lock
-        return lock
-
     def _build_client_order_id_prefix(self, symbol: str, position_side: PositionSide) -> str:
-        """生成 clientOrderId 前缀（用于识别属于本程序的保护止损单）。"""
+        """生成 clientOrderId 前缀（用于识别属于本程序的保护止损单；按 symbol+side 缓存）。"""
+        key = (symbol, position_side)
+        prefix = self._prefix_cache.get(key)
+        if prefix is None:
+            prefix = self._compute_client_order_id_prefix(symbol, position_side)
+            self._prefix_cache[key] = prefix
+        return prefix
+
+    def _compute_client_order_id_prefix(self, symbol: str, position_side: PositionSide) -> str:
         ws_symbol = symbol_to_ws_stream(symbol)
         side_code = "L" if position_side == PositionSide.LONG else "S"
         prefix = f"{self._client_order_id_prefix}{ws_symbol}-{side_code}"
         if len(prefix) >= 30:
-            # 极少数超长 symbol：退化为 hash
-            prefix = f"{self._client_order_id_prefix}{hash(ws_symbol) & 0xfffffff:07x}-{side_code}"
+            # 极少数超长 symbol：退化为 crc32（跨进程稳定，内置 hash() 受 PEP 456 随机化影响）
+            prefix = f"{self._client_order_id_prefix}{zlib.crc32(ws_symbol.encode()) & 0xfffffff:07x}-{side_code}"
         return prefix
 
     def build_client_order_id(self, symbol: str, position_side: PositionSide) -> str:
         """生成唯一的 clientOrderId（前缀 + 时间戳，Binance 要求 clientOrderId 7 天内唯一）。"""
         prefix = self._build_client_order_id_prefix(symbol, position_side)
-        ts = int(time.time() * 1000) % 100000  # 5位时间戳后缀
+        # 纯整数路径；wall clock 跨重启仍递增（monotonic 重启后会回到低位）
+        now_ms = max(time.time_ns() // 1_000_000, self._last_cid_ms + 1)
+        self._last_cid_ms = now_ms
+        ts = now_ms % 100000  # 5位时间戳后缀
         cid = f"{prefix}-{ts}"
         if len(cid) > 36:
             # Binance clientOrderId 限制 36 字符
             cid = cid[:36]
         return cid
 
-    def _match_client_order_id(self, cid: str, symbol: str, position_side: PositionSide) -> bool:
-        """检查 clientOrderId 是否属于指定 symbol+side 的保护止损单。"""
-        prefix = self._build_client_order_id_prefix(symbol, position_side)
-        return cid.startswith(prefix)
+    def _parse_side_from_cid(self, cid: Optional[str], symbol: str) -> Optional[PositionSide]:
+        """
+        从 clientOrderId 直接解析所属 side（不属于该 symbol 的保护止损单时返回 None）。
+
+        LONG/SHORT 前缀只有末位 side_code 不同，先匹配公共部分再看 side_code。
+        """
+        if not cid:
+            return None
+        long_prefix = self._build_client_order_id_prefix(symbol, PositionSide.LONG)
+        base_len = len(long_prefix) - 1
+        if len(cid) <= base_len or not cid.startswith(long_prefix[:base_len]):
+            return None
+        return _SIDE_BY_CODE.get(cid[base_len])
 
     def is_own_algo_order(self, symbol: str, algo_id: str) -> bool:
         """检查 algo_id 是否匹配当前已记录的保护止损单。"""
@@ -146,6 +207,30 @@ class ProtectiveStopManager:
         raw = liquidation_price / (Decimal("1") + dist_to_liq)
         return round_to_tick(raw, tick_size)
 
+    def _get_desired_stop_price(
+        self,
+        *,
+        symbol: str,
+        position_side: PositionSide,
+        liquidation_price: Decimal,
+        dist_to_liq: Decimal,
+        tick_size: Decimal,
+    ) -> Decimal:
+        """compute_stop_price 的按 symbol+side 缓存版本（输入不变时复用上次结果）。"""
+        key = (symbol, position_side)
+        inputs = (liquidation_price, dist_to_liq, tick_size)
+        cached = self._desired_stop_cache.get(key)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+        stop_price = self.compute_stop_price(
+            position_side=position_side,
+            liquidation_price=liquidation_price,
+            dist_to_liq=dist_to_liq,
+            tick_size=tick_size,
+        )
+        self._desired_stop_cache[key] = (inputs, stop_price)
+        return stop_price
+
     def is_stop_price_valid(
         self,
         *,
@@ -182,38 +267,40 @@ class ProtectiveStopManager:
             # 止损价必须低于爆仓价（这样价格上涨时先触发止损）
             return stop_price < liquidation_price * (Decimal("1") - min_dist_ratio)
 
-    def _extract_order_id(self, order: Dict[str, Any]) -> Optional[str]:
+    def _extract_order_id(self, order: Dict[str, Any], info: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """提取订单 ID（支持 algo order 的 algoId 和普通订单的 id）"""
         oid = order.get("algoId") or order.get("orderId") or order.get("id")
         if oid:
             return str(oid)
-        info = order.get("info")
-        if isinstance(info, dict):
-            oid = info.get("algoId") or info.get("orderId") or info.get("id")
-            if oid:
-                return str(oid)
+        if info is None:
+            info = _order_info(order)
+        oid = info.get("algoId") or info.get("orderId") or info.get("id")
+        if oid:
+            return str(oid)
         return None
 
-    def _extract_client_order_id(self, order: Dict[str, Any]) -> Optional[str]:
+    def _extract_client_order_id(self, order: Dict[str, Any], info: Optional[Dict[str, Any]] = None) -> Optional[str]:
         # 支持 algo order 的 clientAlgoId 字段
         cid = order.get("clientAlgoId") or order.get("clientOrderId")
         if cid:
             return str(cid)
-        info = order.get("info")
-        if isinstance(info, dict):
-            cid = info.get("clientAlgoId") or info.get("clientOrderId")
-            if cid:
-                return str(cid)
+        if info is None:
+            info = _order_info(order)
+        cid = info.get("clientAlgoId") or info.get("clientOrderId")
+        if cid:
+            return str(cid)
         return None
 
-    def _extract_position_side(self, order: Dict[str, Any]) -> Optional[PositionSide]:
-        info = order.get("info")
-        if isinstance(info, dict):
-            ps = info.get("positionSide")
-            if ps == "LONG":
-                return PositionSide.LONG
-            if ps == "SHORT":
-                return PositionSide.SHORT
+    def _extract_position_side(
+        self, order: Dict[str, Any], info: Optional[Dict[str, Any]] = None
+    ) -> Optional[PositionSide]:
+        if info is None:
+            info = _order_info(order)
+        ps = info.get("positionSide")
+        if ps == "LONG":
+            return PositionSide.LONG
+        if ps == "SHORT":
+            return PositionSide.SHORT
         ps2 = order.get("positionSide")
         if ps2 == "LONG":
             return PositionSide.LONG
@@ -221,40 +308,39 @@ class ProtectiveStopManager:
             return PositionSide.SHORT
         return None
 
-    def _extract_stop_price(self, order: Dict[str, Any]) -> Optional[Decimal]:
+    def _extract_stop_price(self, order: Dict[str, Any], info: Optional[Dict[str, Any]] = None) -> Optional[Decimal]:
         # 支持 algo order 的 triggerPrice 字段
         sp = order.get("triggerPrice") or order.get("stopPrice")
         if sp is None:
-            info = order.get("info")
-            if isinstance(info, dict):
-                sp = info.get("triggerPrice") or info.get("stopPrice")
+            if info is None:
+                info = _order_info(order)
+            sp = info.get("triggerPrice") or info.get("stopPrice")
         if sp is None:
             return None
-        try:
-            value = Decimal(str(sp))
-        except Exception:
-            return None
+        # 常见输入按类型直转：Decimal 原样返回、int 直接构造，仅 str/float 等走字符串解析
+        if isinstance(sp, Decimal):
+            value = sp
+        elif isinstance(sp, int) and not isinstance(sp, bool):
+            value = Decimal(sp)
+        else:
+            try:
+                value = Decimal(str(sp))
+            except Exception:
+                return None
         return value if value > Decimal("0") else None
 
-    def _extract_order_type(self, order: Dict[str, Any]) -> Optional[str]:
-        order_type_candidates = (
-            order.get("orderType"),
-            order.get("type"),
-            order.get("algoType"),
-        )
-        order_type = next((x for x in order_type_candidates if isinstance(x, str) and x.strip()), None)
-        if order_type is None:
-            info = order.get("info")
-            if isinstance(info, dict):
-                info_candidates = (
-                    info.get("orderType"),
-                    info.get("type"),
-                    info.get("algoType"),
-                )
-                order_type = next((x for x in info_candidates if isinstance(x, str) and x.strip()), None)
-        if order_type is None:
-            return None
-        return order_type.strip().upper()
+    def _extract_order_type(self, order: Dict[str, Any], info: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        for key in _ORDER_TYPE_KEYS:
+            value = order.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip().upper()
+        if info is None:
+            info = _order_info(order)
+        for key in _ORDER_TYPE_KEYS:
+            value = info.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip().upper()
+        return None
 
     @staticmethod
     def _coerce_bool(value: Any) -> Optional[bool]:
@@ -275,65 +361,78 @@ class ProtectiveStopManager:
                 return False
         return None
 
-    def _is_close_position_stop(self, order: Dict[str, Any]) -> bool:
+    def _normalize_order(self, order: Dict[str, Any]) -> _NormalizedOrder:
+        """一次性提取分类与同步所需的全部字段（避免对同一 order 反复解析）。"""
+        info = _order_info(order)
+
+        # closePosition/reduceOnly 只用于判断止损/止盈条件单；非条件单直接跳过解析
+        order_type = self._extract_order_type(order, info)
+        close_pos: Optional[bool] = None
+        reduce_only: Optional[bool] = None
+        if order_type in _STOP_ORDER_TYPES:
+            close_pos = self._coerce_bool(order.get("closePosition"))
+            if close_pos is None:
+                close_pos = self._coerce_bool(info.get("closePosition"))
+            reduce_only = self._coerce_bool(order.get("reduceOnly"))
+            if reduce_only is None:
+                reduce_only = self._coerce_bool(info.get("reduceOnly"))
+        working_type = order.get("workingType")
+        if not isinstance(working_type, str):
+            working_type = info.get("workingType")
+
+        return _NormalizedOrder(
+            position_side=self._extract_position_side(order, info),
+            client_order_id=self._extract_client_order_id(order, info),
+            order_id=self._extract_order_id(order, info),
+            stop_price=self._extract_stop_price(order, info),
+            order_type=order_type,
+            close_position=close_pos,
+            reduce_only=reduce_only,
+            working_type=working_type if isinstance(working_type, str) else None,
+        )
+
+    @staticmethod
+    def _is_close_position_stop(order: _NormalizedOrder) -> bool:
         """检查订单是否是 closePosition 止损单（STOP_MARKET + closePosition=true）"""
-        info = order.get("info")
-        if not isinstance(info, dict):
-            info = {}
-
-        close_pos = self._coerce_bool(order.get("closePosition"))
-        if close_pos is None:
-            close_pos = self._coerce_bool(info.get("closePosition"))
-        if close_pos is not True:
+        if order.order_type not in _STOP_ORDER_TYPES:
             return False
+        return order.close_position is True
 
-        order_type = self._extract_order_type({**order, "info": info})
-        return order_type in ("STOP_MARKET", "TAKE_PROFIT_MARKET", "STOP", "TAKE_PROFIT")
-
-    def _is_reduce_only_stop(self, order: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _is_reduce_only_stop(order: _NormalizedOrder) -> bool:
         """
         检查订单是否是 reduceOnly 的止损/止盈条件单。
 
         语义：外部接管（不要求 closePosition=True）。
         """
-        info = order.get("info")
-        if not isinstance(info, dict):
-            info = {}
-
-        reduce_only = self._coerce_bool(order.get("reduceOnly"))
-        if reduce_only is None:
-            reduce_only = self._coerce_bool(info.get("reduceOnly"))
-        if reduce_only is not True:
+        if order.order_type not in _STOP_ORDER_TYPES:
             return False
-
-        order_type = self._extract_order_type({**order, "info": info})
-        if order_type not in ("STOP_MARKET", "TAKE_PROFIT_MARKET", "STOP", "TAKE_PROFIT"):
+        if order.reduce_only is not True:
             return False
 
         # 必须能确定 positionSide，否则不做外部接管判断（避免误伤）
-        return self._extract_position_side({**order, "info": info}) is not None
+        return order.position_side is not None
 
     async def on_order_update(self, update: OrderUpdate) -> None:
         """处理订单更新：当保护止损成交/撤销后，清理本地状态并触发一次同步。"""
-        for side in (PositionSide.LONG, PositionSide.SHORT):
-            key = (update.symbol, side)
-            state = self._states.get(key)
-            if not state or not update.client_order_id:
-                continue
-            # 使用前缀匹配（因为 clientOrderId 现在包含时间戳后缀）
-            if not self._match_client_order_id(update.client_order_id, update.symbol, side):
-                continue
-            if update.status in (OrderStatus.FILLED, OrderStatus.CANCELED, OrderStatus.REJECTED, OrderStatus.EXPIRED):
-                self._states.pop(key, None)
-                log_event(
-                    "risk",
-                    symbol=update.symbol,
-                    side=side.value,
-                    risk_stage=self._risk_stage,
-                    risk_level=self._get_risk_level(),
-                    reason=f"order_update={update.status.value}",
-                    order_id=update.order_id,
-                )
+        # 使用前缀解析 side（因为 clientOrderId 包含时间戳后缀）
+        side = self._parse_side_from_cid(update.client_order_id, update.symbol)
+        if side is None:
+            return
+        key = (update.symbol, side)
+        if key not in self._states:
+            return
+        if update.status in (OrderStatus.FILLED, OrderStatus.CANCELED, OrderStatus.REJECTED, OrderStatus.EXPIRED):
+            self._states.pop(key, None)
+            log_event(
+                "risk",
+                symbol=update.symbol,
+                side=side.value,
+                risk_stage=self._risk_stage,
+                risk_level=self._get_risk_level(),
+                reason=f"order_update={update.status.value}",
+                order_id=update.order_id,
+            )
 
     def on_algo_order_update(self, update: AlgoOrderUpdate) -> None:
         """
@@ -342,29 +441,67 @@ class ProtectiveStopManager:
         当我们的保护止损单状态变化时，清理本地状态。
         注：只处理我们自己的订单（由 main.py 在调用前用前缀过滤）。
         """
-        # Algo Order 终态
-        terminal_statuses = {"CANCELED", "FILLED", "TRIGGERED", "EXPIRED", "REJECTED", "FINISHED"}
-        if update.status.upper() not in terminal_statuses:
+        if update.status.upper() not in _ALGO_TERMINAL_STATUSES:
             return
 
-        for side in (PositionSide.LONG, PositionSide.SHORT):
-            key = (update.symbol, side)
-            state = self._states.get(key)
-            if not state:
-                continue
-            # 前缀匹配
-            if not self._match_client_order_id(update.client_algo_id, update.symbol, side):
-                continue
-            self._states.pop(key, None)
-            log_event(
-                "risk",
-                symbol=update.symbol,
-                side=side.value,
-                risk_stage=self._risk_stage,
-                risk_level=self._get_risk_level(),
-                reason=f"algo_update={update.status}",
-                algo_id=update.algo_id,
-            )
+        # 前缀解析 side
+        side = self._parse_side_from_cid(update.client_algo_id, update.symbol)
+        if side is None:
+            return
+        key = (update.symbol, side)
+        if key not in self._states:
+            return
+        self._states.pop(key, None)
+        log_event(
+            "risk",
+            symbol=update.symbol,
+            side=side.value,
+            risk_stage=self._risk_stage,
+            risk_level=self._get_risk_level(),
+            reason=f"algo_update={update.status}",
+            algo_id=update.algo_id,
+        )
+
+    async def _fetch_open_orders(self, symbol: str, sync_reason: Optional[str]) -> Sequence[Any]:
+        """
+        获取普通 openOrders。
+
+        保护止损依赖“外部 stop/tp 接管”判断。ccxt 可能漏掉 closePosition 的 STOP/TP（例如 origQty=0），
+        因此这里以 raw openOrders 为主（若不可用则回退 ccxt fetch_open_orders）。
+        """
+        if hasattr(self._exchange, "fetch_open_orders_raw"):
+            try:
+                return await getattr(self._exchange, "fetch_open_orders_raw")(symbol)  # type: ignore[misc]
+            except Exception as e:
+                log_error(f"获取 raw openOrders 失败: {e}", symbol=symbol, reason=sync_reason)
+        return await self._exchange.fetch_open_orders(symbol)
+
+    async def _fetch_all_orders(self, symbol: str, sync_reason: Optional[str]) -> Optional[list[_NormalizedOrder]]:
+        """拉取并合并 openOrders 与 openAlgoOrders（失败返回 None）。"""
+        try:
+            # openOrders 与 algo 挂单（条件订单在 2025-12-09 后迁移到 Algo Service）互不依赖，并发查询；
+            # 任一失败（或外层被取消）时取消另一个，避免留下无人等待的请求
+            open_task = asyncio.create_task(self._fetch_open_orders(symbol, sync_reason))
+            algo_task = asyncio.create_task(self._exchange.fetch_open_algo_orders(symbol))
+            try:
+                open_orders, algo_orders = await asyncio.gather(open_task, algo_task)
+            except BaseException:
+                open_task.cancel()
+                algo_task.cancel()
+                raise
+
+            # 合并所有订单（每张单只解析一次）
+            all_orders: list[_NormalizedOrder] = []
+            for o in list(open_orders):
+                if isinstance(o, dict):
+                    all_orders.append(self._normalize_order(o))
+            for o in list(algo_orders):
+                if isinstance(o, dict):
+                    all_orders.append(self._normalize_order(o))
+        except Exception as e:
+            log_error(f"保护止损同步失败（获取挂单）: {e}", symbol=symbol)
+            return None
+        return all_orders
 
     async def sync_symbol(
         self,
@@ -378,148 +515,151 @@ class ProtectiveStopManager:
         sync_reason: Optional[str] = None,
     ) -> Dict[PositionSide, bool]:
         """同步某个 symbol 的保护止损（会访问交易所 openOrders 和 openAlgoOrders）。"""
-        async with self._get_lock(symbol):
-            try:
-                # 保护止损依赖“外部 stop/tp 接管”判断。ccxt 可能漏掉 closePosition 的 STOP/TP（例如 origQty=0），
-                # 因此这里以 raw openOrders 为主（若不可用则回退 ccxt fetch_open_orders）。
-                if hasattr(self._exchange, "fetch_open_orders_raw"):
-                    try:
-                        open_orders = await getattr(self._exchange, "fetch_open_orders_raw")(symbol)  # type: ignore[misc]
-                    except Exception as e:
-                        log_error(f"获取 raw openOrders 失败: {e}", symbol=symbol, reason=sync_reason)
-                        open_orders = await self._exchange.fetch_open_orders(symbol)
-                else:
-                    open_orders = await self._exchange.fetch_open_orders(symbol)
-
-                # 查询 algo 挂单（条件订单在 2025-12-09 后迁移到 Algo Service）
-                algo_orders = await self._exchange.fetch_open_algo_orders(symbol)
-
-                # 合并所有订单
-                all_orders: list[Dict[str, Any]] = []
-                for o in list(open_orders):
-                    if isinstance(o, dict):
-                        all_orders.append(o)
-                for o in list(algo_orders):
-                    if isinstance(o, dict):
-                        all_orders.append(o)
-            except Exception as e:
-                log_error(f"保护止损同步失败（获取挂单）: {e}", symbol=symbol)
+        # 拉单不持锁；若拉单期间同 symbol 有其他同步完成（可能已撤单/下单），快照可能过期，
+        # 则在锁内重新拉取，避免基于过期快照重复下单。
+        generation = self._sync_generation[symbol]
+        all_orders = await self._fetch_all_orders(symbol, sync_reason)
+        async with self._locks[symbol]:
+            if self._sync_generation[symbol] != generation:
+                all_orders = await self._fetch_all_orders(symbol, sync_reason)
+            if all_orders is None:
                 return {PositionSide.LONG: False, PositionSide.SHORT: False}
+            try:
+                return await self._sync_orders(
+                    symbol=symbol,
+                    rules=rules,
+                    positions=positions,
+                    enabled=enabled,
+                    dist_to_liq=dist_to_liq,
+                    all_orders=all_orders,
+                    external_stop_latch_by_side=external_stop_latch_by_side,
+                    sync_reason=sync_reason,
+                )
+            finally:
+                self._sync_generation[symbol] += 1
 
-            # 分类订单：我们自己的（前缀匹配）vs 外部的 closePosition 止损单
-            orders_by_side: Dict[PositionSide, list[Dict[str, Any]]] = {PositionSide.LONG: [], PositionSide.SHORT: []}
-            external_stops_by_side: Dict[PositionSide, bool] = {PositionSide.LONG: False, PositionSide.SHORT: False}
-            external_stop_orders_by_side: Dict[PositionSide, list[Dict[str, Any]]] = {
-                PositionSide.LONG: [],
-                PositionSide.SHORT: [],
-            }
-            external_latch_by_side = external_stop_latch_by_side or {}
-            external_stop_sample_by_side: Dict[PositionSide, Dict[str, Any]] = {}
-
-            for order in all_orders:
-                if not isinstance(order, dict):
-                    continue
-                ps = self._extract_position_side(order)
-                if ps is None:
-                    continue
+    async def _sync_orders(
+        self,
+        *,
+        symbol: str,
+        rules: SymbolRules,
+        positions: Dict[PositionSide, Position],
+        enabled: bool,
+        dist_to_liq: Decimal,
+        all_orders: Sequence[_NormalizedOrder],
+        external_stop_latch_by_side: Optional[Dict[PositionSide, bool]],
+        sync_reason: Optional[str],
+    ) -> Dict[PositionSide, bool]:
+        """基于挂单快照分类并逐 side 同步（调用方持有 symbol 锁）。"""
+        # 分类订单：我们自己的（前缀匹配）vs 外部的 closePosition 止损单
+        orders_by_side: Dict[PositionSide, list[_NormalizedOrder]] = {PositionSide.LONG: [], PositionSide.SHORT: []}
+        external_stops_by_side: Dict[PositionSide, bool] = {PositionSide.LONG: False, PositionSide.SHORT: False}
+        external_stop_orders_by_side: Dict[PositionSide, list[_NormalizedOrder]] = {
+            PositionSide.LONG: [],
+            PositionSide.SHORT: [],
+        }
+        external_latch_by_side = external_stop_latch_by_side or {}
+        external_stop_sample_by_side: Dict[PositionSide, _NormalizedOrder] = {}
+        prefix_by_side: Dict[PositionSide, str] = {
+            PositionSide.LONG: self._build_client_order_id_prefix(symbol, PositionSide.LONG),
+            PositionSide.SHORT: self._build_client_order_id_prefix(symbol, PositionSide.SHORT),
+        }
+
+        for order in all_orders:
+            ps = order.position_side
+            if ps is None:
+                continue
+
+            cid = order.client_order_id
+            if cid and cid.startswith(prefix_by_side[ps]):
+                # 我们自己的订单
+                orders_by_side[ps].append(order)
+            elif self._is_close_position_stop(order) or self._is_reduce_only_stop(order):
+                # 外部的 closePosition 或 reduceOnly 止损/止盈单
+                external_stops_by_side[ps] = True
+                external_stop_orders_by_side[ps].append(order)
+                external_stop_sample_by_side.setdefault(ps, order)
+
+        # 外部多单告警：同一 symbol+side 出现多张外部 stop/tp（可能来自多端手动设置）
+        for side in (PositionSide.LONG, PositionSide.SHORT):
+            externals = external_stop_orders_by_side.get(side) or []
+            if len(externals) <= 1:
+                continue
+            key = (symbol, side)
+            ids = tuple(sorted(o.order_id for o in externals if o.order_id))
+            if ids and self._external_multi_sig.get(key) == ids:
+                continue
+            self._external_multi_sig[key] = ids
+            log_event(
+                "risk",
+                symbol=symbol,
+                side=side.value,
+                risk_stage=self._risk_stage,
+                risk_level=self._get_risk_level(),
+                reason="external_stop_multiple",
+                count=len(externals),
+                order_ids=ids,
+            )
 
-                cid = self._extract_client_order_id(order)
-                if cid and self._match_client_order_id(cid, symbol, ps):
-                    # 我们自己的订单
-                    orders_by_side[ps].append(order)
-                elif self._is_close_position_stop(order) or self._is_reduce_only_stop(order):
-                    # 外部的 closePosition 或 reduceOnly 止损/止盈单
-                    external_stops_by_side[ps] = True
-                    external_stop_orders_by_side[ps].append(order)
-                    external_stop_sample_by_side.setdefault(ps, order)
-
-            # 外部多单告警：同一 symbol+side 出现多张外部 stop/tp（可能来自多端手动设置）
+        if sync_reason == "startup":
             for side in (PositionSide.LONG, PositionSide.SHORT):
-                externals = external_stop_orders_by_side.get(side) or []
-                if len(externals) <= 1:
+                bit = _STARTUP_LOGGED_OWN_BITS[side]
+                if self._startup_logged_bits.get(symbol, 0) & bit:
                     continue
-                key = (symbol, side)
-                ids = tuple(
-                    sorted(x for x in (self._extract_order_id(o) for o in externals) if x)
-                )
-                if ids and self._external_multi_sig.get(key) == ids:
+                existing = orders_by_side.get(side) or []
+                if not existing:
                     continue
-                self._external_multi_sig[key] = ids
+                first = existing[0]
+                self._startup_logged_bits[symbol] = self._startup_logged_bits.get(symbol, 0) | bit
                 log_event(
                     "risk",
                     symbol=symbol,
                     side=side.value,
                     risk_stage=self._risk_stage,
                     risk_level=self._get_risk_level(),
-                    reason="external_stop_multiple",
-                    count=len(externals),
-                    order_ids=ids,
+                    reason="startup_existing_own_stop",
+                    count=len(existing),
+                    order_id=first.order_id,
+                    client_order_id=first.client_order_id,
                 )
-
-            if sync_reason == "startup":
-                for side in (PositionSide.LONG, PositionSide.SHORT):
-                    key = (symbol, side)
-                    if key in self._startup_existing_logged:
-                        continue
-                    existing = orders_by_side.get(side) or []
-                    if not existing:
-                        continue
-                    first = existing[0]
-                    self._startup_existing_logged.add(key)
-                    log_event(
-                        "risk",
-                        symbol=symbol,
-                        side=side.value,
-                        risk_stage=self._risk_stage,
-                        risk_level=self._get_risk_level(),
-                        reason="startup_existing_own_stop",
-                        count=len(existing),
-                        order_id=self._extract_order_id(first),
-                        client_order_id=self._extract_client_order_id(first),
-                    )
-                for side in (PositionSide.LONG, PositionSide.SHORT):
-                    key = (symbol, side)
-                    if key in self._startup_existing_external_logged:
-                        continue
-                    externals = external_stop_orders_by_side.get(side) or []
-                    self._startup_existing_external_logged.add(key)
-                    if not externals:
-                        continue
-                    sample = external_stop_sample_by_side.get(side)
-                    raw_info = sample.get("info") if isinstance(sample, dict) else None
-                    info: Dict[str, Any] = raw_info if isinstance(raw_info, dict) else {}
-                    working_type = sample.get("workingType") if isinstance(sample, dict) else None
-                    if not isinstance(working_type, str):
-                        working_type = info.get("workingType")
-                    stop_price = self._extract_stop_price(sample) if isinstance(sample, dict) else None
-                    log_event(
-                        "risk",
-                        symbol=symbol,
-                        side=side.value,
-                        risk_stage=self._risk_stage,
-                        risk_level=self._get_risk_level(),
-                        reason="startup_existing_external_stop",
-                        order_id=self._extract_order_id(sample) if sample else None,
-                        client_order_id=self._extract_client_order_id(sample) if sample else None,
-                        stop_price=str(stop_price) if stop_price is not None else None,
-                        working_type=working_type,
-                    )
-
             for side in (PositionSide.LONG, PositionSide.SHORT):
-                await self._sync_side(
+                bit = _STARTUP_LOGGED_EXTERNAL_BITS[side]
+                if self._startup_logged_bits.get(symbol, 0) & bit:
+                    continue
+                externals = external_stop_orders_by_side.get(side) or []
+                self._startup_logged_bits[symbol] = self._startup_logged_bits.get(symbol, 0) | bit
+                if not externals:
+                    continue
+                sample = external_stop_sample_by_side.get(side)
+                stop_price = sample.stop_price if sample else None
+                log_event(
+                    "risk",
                     symbol=symbol,
-                    side=side,
-                    rules=rules,
-                    position=positions.get(side),
-                    enabled=enabled,
-                    dist_to_liq=dist_to_liq,
-                    existing_orders=orders_by_side.get(side) or [],
-                    has_external_stop=external_stops_by_side.get(side, False),
-                    external_stop_orders=external_stop_orders_by_side.get(side) or [],
-                    external_stop_sample=external_stop_sample_by_side.get(side),
-                    has_external_stop_latch=bool(external_latch_by_side.get(side, False)),
+                    side=side.value,
+                    risk_stage=self._risk_stage,
+                    risk_level=self._get_risk_level(),
+                    reason="startup_existing_external_stop",
+                    order_id=sample.order_id if sample else None,
+                    client_order_id=sample.client_order_id if sample else None,
+                    stop_price=str(stop_price) if stop_price is not None else None,
+                    working_type=sample.working_type if sample else None,
                 )
-            return external_stops_by_side
+
+        for side in (PositionSide.LONG, PositionSide.SHORT):
+            await self._sync_side(
+                symbol=symbol,
+                side=side,
+                rules=rules,
+                position=positions.get(side),
+                enabled=enabled,
+                dist_to_liq=dist_to_liq,
+                existing_orders=orders_by_side.get(side) or [],
+                has_external_stop=external_stops_by_side.get(side, False),
+                external_stop_orders=external_stop_orders_by_side.get(side) or [],
+                external_stop_sample=external_stop_sample_by_side.get(side),
+                has_external_stop_latch=bool(external_latch_by_side.get(side, False)),
+            )
+        return external_stops_by_side
 
     async def _sync_side(
         self,
@@ -530,33 +670,32 @@ class ProtectiveStopManager:
         position: Optional[Position],
         enabled: bool,
         dist_to_liq: Decimal,
-        existing_orders: Sequence[Dict[str, Any]],
+        existing_orders: Sequence[_NormalizedOrder],
         has_external_stop: bool = False,
-        external_stop_orders: Optional[Sequence[Dict[str, Any]]] = None,
-        external_stop_sample: Optional[Dict[str, Any]] = None,
+        external_stop_orders: Optional[Sequence[_NormalizedOrder]] = None,
+        external_stop_sample: Optional[_NormalizedOrder] = None,
         has_external_stop_latch: bool = False,
     ) -> None:
         desired_cid = self.build_client_order_id(symbol, side)
 
-        # 多余的重复单先撤掉（理论上不应出现）
-        keep_order: Optional[Dict[str, Any]] = None
-        for order in existing_orders:
-            if keep_order is None:
-                keep_order = order
-                continue
-            order_id = self._extract_order_id(order)
-            if order_id:
-                try:
-                    await self._exchange.cancel_order(symbol, order_id)
-                except Exception as e:
-                    log_error(f"保护止损撤单失败: {e}", symbol=symbol, order_id=order_id)
+        # 多余的重复单先撤掉（理论上不应出现）：保留第一张，其余并发撤单
+        keep_order: Optional[_NormalizedOrder] = existing_orders[0] if existing_orders else None
+        dup_order_ids = [order.order_id for order in existing_orders[1:] if order.order_id]
+        if dup_order_ids:
+            results = await asyncio.gather(
+                *(self._exchange.cancel_order(symbol, order_id) for order_id in dup_order_ids),
+                return_exceptions=True,
+            )
+            for order_id, result in zip(dup_order_ids, results):
+                if isinstance(result, BaseException):
+                    log_error(f"保护止损撤单失败: {result}", symbol=symbol, order_id=order_id)
 
         has_position = position is not None and abs(position.position_amt) > Decimal("0")
 
         # 未启用或无仓位：确保无保护止损单
         if (not enabled) or (not has_position):
             if keep_order is not None:
-                order_id = self._extract_order_id(keep_order)
+                order_id = keep_order.order_id
                 if order_id:
                     try:
                         await self._exchange.cancel_order(symbol, order_id)
@@ -585,11 +724,11 @@ class ProtectiveStopManager:
                 orders = [external_stop_sample]
 
             has_unknown_external = False
-            valid_external_orders: list[Dict[str, Any]] = []
-            invalid_external_orders: list[Dict[str, Any]] = []
+            valid_external_orders: list[_NormalizedOrder] = []
+            invalid_external_orders: list[_NormalizedOrder] = []
 
             for order in orders:
-                stop_price = self._extract_stop_price(order)
+                stop_price = order.stop_price
                 if stop_price is None or liq_price is None or liq_price <= Decimal("0"):
                     # 无法提取止损价时，保守地认为有效（避免误删）
                     has_unknown_external = True
@@ -610,8 +749,8 @@ class ProtectiveStopManager:
                 # 无效的外部止损 → 取消并由程序接管
                 for invalid_order in invalid_external_orders:
                     invalid_detected = True
-                    external_order_id = self._extract_order_id(invalid_order)
-                    external_stop_price = self._extract_stop_price(invalid_order)
+                    external_order_id = invalid_order.order_id
+                    external_stop_price = invalid_order.stop_price
                     if not external_order_id:
                         continue
                     try:
@@ -633,7 +772,7 @@ class ProtectiveStopManager:
             if has_valid_external:
                 # 有效的外部止损 → 保持原有"外部接管"逻辑（撤掉我们自己的，停止维护）
                 if keep_order is not None:
-                    order_id = self._extract_order_id(keep_order)
+                    order_id = keep_order.order_id
                     if order_id:
                         try:
                             await self._exchange.cancel_order(symbol, order_id)
@@ -673,7 +812,8 @@ class ProtectiveStopManager:
             return
 
         try:
-            desired_stop_price = self.compute_stop_price(
+            desired_stop_price = self._get_desired_stop_price(
+                symbol=symbol,
                 position_side=side,
                 liquidation_price=liquidation_price,
                 dist_to_liq=dist_to_liq,
@@ -683,18 +823,17 @@ class ProtectiveStopManager:
             log_error(f"保护止损 stopPrice 计算失败: {e}", symbol=symbol, side=side.value)
             return
 
-        existing_stop_price = self._extract_stop_price(keep_order) if keep_order is not None else None
-        existing_order_id = self._extract_order_id(keep_order) if keep_order is not None else None
-        existing_cid = self._extract_client_order_id(keep_order) if keep_order is not None else None
+        existing_stop_price = keep_order.stop_price if keep_order is not None else None
+        existing_order_id = keep_order.order_id if keep_order is not None else None
+        existing_cid = keep_order.client_order_id if keep_order is not None else None
 
         # stopPrice 相同：更新本地缓存即可
         # 注意：交易所/ccxt 可能以 float 返回 triggerPrice，直接 Decimal 精确比较会抖动
+        # desired_stop_price 已在 compute_stop_price 内按 tick 取整，只需规整 existing
         if keep_order is not None and existing_stop_price is not None:
             existing_norm = round_to_tick(existing_stop_price, rules.tick_size)
-            desired_norm = round_to_tick(desired_stop_price, rules.tick_size)
         else:
             existing_norm = None
-            desired_norm = None
 
         # 只允许“收紧”止损：禁止把 stopPrice 往“更远/更松”方向移动
         # LONG：stopPrice 越高越早触发（更紧），不允许下调
@@ -702,10 +841,9 @@ class ProtectiveStopManager:
         if (
             keep_order is not None
             and existing_norm is not None
-            and desired_norm is not None
             and (
-                (side == PositionSide.LONG and desired_norm < existing_norm)
-                or (side == PositionSide.SHORT and desired_norm > existing_norm)
+                (side == PositionSide.LONG and desired_stop_price < existing_norm)
+                or (side == PositionSide.SHORT and desired_stop_price > existing_norm)
             )
         ):
             self._states[(symbol, side)] = ProtectiveStopState(
@@ -717,7 +855,7 @@ class ProtectiveStopManager:
             )
             return
 
-        if keep_order is not None and existing_norm is not None and desired_norm is not None and existing_norm == desired_norm:
+        if keep_order is not None and existing_norm is not None and existing_norm == desired_stop_price:
             self._states[(symbol, side)] = ProtectiveStopState(
                 symbol=symbol,
                 position_side=side,
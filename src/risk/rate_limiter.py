@@ -1,6 +1,6 @@
 # Input: request timestamps and limits
 # Output: allow/deny decisions
-# Pos: sliding window rate limiter
+# Pos: sliding window rate limiter (fixed-size ring buffer, slotted)
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
@@ -8,24 +8,31 @@
 
 用于限制下单/撤单频率，避免触发交易所速率限制。
 实现采用固定窗口滑动计数：统计最近 1 秒内的请求数。
+只需判断“最近 max_events 次中最早的一次”是否仍在窗口内，
+因此用长度为 max_events 的环形缓冲区保存时间戳，每次判断 O(1)。
 """
 
 from __future__ import annotations
 
-from collections import deque
+from array import array
 from dataclasses import dataclass, field
-from typing import Deque, Optional
+from typing import Optional
 
 from src.utils.helpers import current_time_ms
 
 
-@dataclass
+@dataclass(slots=True)
 class SlidingWindowRateLimiter:
     """最近 window_ms 内最多允许 max_events 次。"""
 
     max_events: int
     window_ms: int = 1000
-    _events_ms: Deque[int] = field(default_factory=deque)
+    _buf: array = field(init=False, repr=False)
+    _idx: int = field(default=0, init=False, repr=False)
+    _count: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._buf = array("q", [0] * max(self.max_events, 0))
 
     def try_acquire(self, current_ms: Optional[int] = None) -> bool:
         """
@@ -38,14 +45,21 @@ class SlidingWindowRateLimiter:
             return True
 
         now_ms = current_ms if current_ms is not None else current_time_ms()
-        cutoff = now_ms - self.window_ms
+        buf = self._buf
+        count = self._count
 
-        while self._events_ms and self._events_ms[0] <= cutoff:
-            self._events_ms.popleft()
+        if count < self.max_events:
+            # 缓冲区未满：顺序写入（未满时 _idx 恒为 0，指向最早的一次）
+            buf[count] = now_ms
+            self._count = count + 1
+            return True
 
-        if len(self._events_ms) >= self.max_events:
+        # 缓冲区已满：_idx 位置是最近 max_events 次中最早的一次
+        idx = self._idx
+        if now_ms - buf[idx] < self.window_ms:
             return False
 
-        self._events_ms.append(now_ms)
+        buf[idx] = now_ms
+        idx += 1
+        self._idx = 0 if idx == count else idx
         return True
-
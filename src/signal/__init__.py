@@ -12,4 +12,4 @@
 
 from src.signal.engine import SignalEngine
 
-__all__ = ["SignalEngine"]
+__all__ = ("SignalEngine",)
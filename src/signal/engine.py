@@ -21,9 +21,12 @@
 - ExitSignal（满足条件时）
 """
 
+from bisect import bisect_right
 from collections import deque
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Deque, Dict, Optional, Tuple, List
+from itertools import accumulate
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple, List
 
 from src.models import (
     MarketEvent,
@@ -36,6 +39,70 @@ from src.models import (
 from src.utils.logger import get_logger, log_signal
 from src.utils.helpers import current_time_ms
 
+# 热路径常用常量（Decimal 不可变，可安全共享，避免每次调用解析字符串构造）
+_D0 = Decimal("0")
+_D1 = Decimal("1")
+
+
+def _compile_tiers(tiers: List[Tuple[Decimal, int]]) -> Tuple[List[Decimal], List[int]]:
+    """
+    档位预编译为 (升序阈值, 前缀最大 mult)，mult 规整为 >=1 的 int。
+
+    满足条件（value >= threshold）的档位总是升序前缀，
+    bisect_right(thresholds, value) 即满足的档位数，对应前缀最大值即为最高档。
+    """
+    ordered = sorted(tiers, key=lambda x: x[0])
+    thresholds = [threshold for threshold, _ in ordered]
+    mults = list(accumulate((max(int(mult), 1) for _, mult in ordered), max))
+    return thresholds, mults
+
+
+def _select_tier_mult(thresholds: List[Decimal], mults: List[int], value: Decimal) -> int:
+    """按预编译档位选择 mult（无满足档位时为 1）。"""
+    idx = bisect_right(thresholds, value)
+    return mults[idx - 1] if idx else 1
+
+
+@dataclass(slots=True)
+class _SymbolSignalConfig:
+    """
+    per-symbol 信号参数（configure_symbol 时解析默认值并预编译档位，evaluate 只需一次查找）
+
+    档位见 _compile_tiers；accel 档位 LONG/SHORT 共用（SHORT 按 -ret 选择：ret <= -threshold）。
+    """
+
+    min_signal_interval_ms: int
+    accel_window_ms: int = 2000
+    accel_thresholds: List[Decimal] = field(default_factory=list)
+    accel_mults: List[int] = field(default_factory=list)
+    roi_thresholds: List[Decimal] = field(default_factory=list)
+    roi_mults: List[int] = field(default_factory=list)
+
+
+def _new_trade_history(
+    accel_window_ms: int, items: Iterable[Tuple[int, Decimal]] = ()
+) -> Deque[Tuple[int, Decimal]]:
+    """
+    创建 accel trade 历史队列。
+
+    队列内时间戳严格递增（毫秒），窗口内最多 window_ms + 1 个点；
+    maxlen 是写入路径上唯一的增长上限（按时间淘汰只在 _compute_accel_ret 中进行）。
+    """
+    return deque(items, maxlen=max(accel_window_ms, 0) + 1)
+
+
+@dataclass(slots=True)
+class _SymbolMarketData:
+    """per-symbol 行情运行时数据（update_market/evaluate 每次只需一次 dict 查找）。"""
+
+    state: MarketState
+    cfg: _SymbolSignalConfig
+    history: Deque[Tuple[int, Decimal]]  # trade 价格序列（用于 accel 滑动窗口）
+    has_book_data: bool = False  # 是否收到过 bid/ask
+    has_trade_data: bool = False  # 是否收到过 trade
+    # 上次评估无平仓条件、且此后 bid/ask/trade 未变化的 side（退出条件只取决于这些价格）
+    quiet_sides: Set[PositionSide] = field(default_factory=set)
+
 
 class SignalEngine:
     """信号引擎"""
@@ -48,22 +115,15 @@ class SignalEngine:
             min_signal_interval_ms: 同一侧仓位两次信号的最小间隔
         """
         self.min_signal_interval_ms = min_signal_interval_ms
-        self._market_states: Dict[str, MarketState] = {}
-        self._last_signal_ms: Dict[str, int] = {}  # key: symbol:position_side
-        self._last_logged_signal: Dict[str, Tuple[SignalReason, Decimal, Decimal, Decimal]] = {}  # key: symbol:position_side
+        self._market_data: Dict[str, _SymbolMarketData] = {}
+        self._last_signal_ms: Dict[Tuple[str, PositionSide], int] = {}  # key: (symbol, position_side)
+        self._last_logged_signal: Dict[
+            Tuple[str, PositionSide], Tuple[SignalReason, Decimal, Decimal, Decimal]
+        ] = {}  # key: (symbol, position_side)
 
-        # 追踪是否收到过 bid/ask 和 trade 数据
-        self._has_book_data: Dict[str, bool] = {}
-        self._has_trade_data: Dict[str, bool] = {}
-
-        # per-symbol 参数（允许覆盖）
-        self._symbol_min_signal_interval_ms: Dict[str, int] = {}
-        self._symbol_accel_window_ms: Dict[str, int] = {}
-        self._symbol_accel_tiers: Dict[str, List[Tuple[Decimal, int]]] = {}
-        self._symbol_roi_tiers: Dict[str, List[Tuple[Decimal, int]]] = {}
-
-        # trade 价格序列（用于 accel 滑动窗口）
-        self._trade_history: Dict[str, Deque[Tuple[int, Decimal]]] = {}
+        # per-symbol 参数（允许覆盖）；未配置的 symbol 使用默认参数
+        self._default_symbol_config = _SymbolSignalConfig(min_signal_interval_ms=min_signal_interval_ms)
+        self._symbol_configs: Dict[str, _SymbolSignalConfig] = {}
 
     def configure_symbol(
         self,
@@ -75,16 +135,24 @@ class SignalEngine:
         roi_tiers: Optional[List[Tuple[Decimal, int]]] = None,
     ) -> None:
         """配置某个 symbol 的节流/倍数档位参数。"""
+        cfg = self._symbol_configs.get(symbol)
+        if cfg is None:
+            cfg = _SymbolSignalConfig(min_signal_interval_ms=self.min_signal_interval_ms)
+            self._symbol_configs[symbol] = cfg
         if min_signal_interval_ms is not None:
-            self._symbol_min_signal_interval_ms[symbol] = min_signal_interval_ms
+            cfg.min_signal_interval_ms = min_signal_interval_ms
         if accel_window_ms is not None:
-            self._symbol_accel_window_ms[symbol] = accel_window_ms
+            cfg.accel_window_ms = accel_window_ms
         if accel_tiers is not None:
-            self._symbol_accel_tiers[symbol] = sorted(accel_tiers, key=lambda x: x[0])
+            cfg.accel_thresholds, cfg.accel_mults = _compile_tiers(accel_tiers)
         if roi_tiers is not None:
-            self._symbol_roi_tiers[symbol] = sorted(roi_tiers, key=lambda x: x[0])
+            cfg.roi_thresholds, cfg.roi_mults = _compile_tiers(roi_tiers)
 
-        self._trade_history.setdefault(symbol, deque())
+        data = self._market_data.get(symbol)
+        if data is not None:
+            # 已有行情数据：切换到该 symbol 的参数，并按新窗口重建 trade 历史的容量上限
+            data.cfg = cfg
+            data.history = _new_trade_history(cfg.accel_window_ms, data.history)
 
     def update_market(self, event: MarketEvent) -> None:
         """
@@ -98,22 +166,26 @@ class SignalEngine:
             event: 市场数据事件
         """
         symbol = event.symbol
-        state = self._market_states.get(symbol)
+        data = self._market_data.get(symbol)
 
-        if state is None:
+        if data is None:
             # 初始化 MarketState
-            state = MarketState(
-                symbol=symbol,
-                best_bid=Decimal("0"),
-                best_ask=Decimal("0"),
-                last_trade_price=Decimal("0"),
-                previous_trade_price=None,
-                last_update_ms=0,
-                is_ready=False,
+            cfg = self._symbol_configs.get(symbol, self._default_symbol_config)
+            data = _SymbolMarketData(
+                state=MarketState(
+                    symbol=symbol,
+                    best_bid=_D0,
+                    best_ask=_D0,
+                    last_trade_price=_D0,
+                    previous_trade_price=None,
+                    last_update_ms=0,
+                    is_ready=False,
+                ),
+                cfg=cfg,
+                history=_new_trade_history(cfg.accel_window_ms),
             )
-            self._market_states[symbol] = state
-            self._has_book_data[symbol] = False
-            self._has_trade_data[symbol] = False
+            self._market_data[symbol] = data
+        state = data.state
 
         # 更新时间戳
         state.last_update_ms = event.timestamp_ms
@@ -124,30 +196,47 @@ class SignalEngine:
                 state.best_bid = event.best_bid
             if event.best_ask is not None:
                 state.best_ask = event.best_ask
-            self._has_book_data[symbol] = True
+            data.has_book_data = True
+            if data.quiet_sides:
+                data.quiet_sides.clear()
 
         elif event.event_type == "agg_trade":
             # 更新 trade price，保存上一次价格
             if event.last_trade_price is not None:
                 # 维护 trade 历史（用于 accel 滑动窗口）
-                history = self._trade_history.setdefault(symbol, deque())
-                history.append((event.timestamp_ms, event.last_trade_price))
+                # 只保留可能成为窗口起点（window_ago）的点：时间戳不晚于队尾的点
+                # 永远先于/随队尾一起被淘汰，不会成为起点（同毫秒突发成交只记第一笔）
+                history = data.history
+                if not history or event.timestamp_ms > history[-1][0]:
+                    history.append((event.timestamp_ms, event.last_trade_price))
+                # 写入时只靠 maxlen 限长（无仓位时 evaluate 不会走到 accel 计算，避免历史无界增长）；
+                # 按时间淘汰统一留给 _compute_accel_ret 以本地 current_ms 判断，避免交易所时钟超前时误删窗口起点
 
                 # 只有当 last_trade_price 已有有效值时才保存到 previous
-                if state.last_trade_price > Decimal("0"):
+                if state.last_trade_price > _D0:
                     state.previous_trade_price = state.last_trade_price
                 state.last_trade_price = event.last_trade_price
-                self._has_trade_data[symbol] = True
+                data.has_trade_data = True
+                if data.quiet_sides:
+                    data.quiet_sides.clear()
+
+        if state.is_ready:
+            # 已就绪：book/trade 标记与 previous_trade_price 只会单调置位，只需复核本次写入的价格
+            if event.event_type == "book_ticker":
+                state.is_ready = state.best_bid > _D0 and state.best_ask > _D0
+            elif event.event_type == "agg_trade":
+                state.is_ready = state.last_trade_price > _D0
+            return
 
         # 检查数据是否就绪
         # 就绪条件：有 bid/ask 数据 AND 有 trade 数据 AND 有 previous trade price
         state.is_ready = (
-            self._has_book_data.get(symbol, False)
-            and self._has_trade_data.get(symbol, False)
+            data.has_book_data
+            and data.has_trade_data
             and state.previous_trade_price is not None
-            and state.best_bid > Decimal("0")
-            and state.best_ask > Decimal("0")
-            and state.last_trade_price > Decimal("0")
+            and state.best_bid > _D0
+            and state.best_ask > _D0
+            and state.last_trade_price > _D0
         )
 
     def evaluate(
@@ -173,16 +262,23 @@ class SignalEngine:
             current_ms = current_time_ms()
 
         # 检查数据是否就绪
-        state = self._market_states.get(symbol)
-        if state is None or not state.is_ready:
+        data = self._market_data.get(symbol)
+        if data is None or not data.state.is_ready:
+            return None
+        state = data.state
+
+        # 价格未变化且上次无平仓条件：结果必然仍为 None（与节流/仓位无关）
+        if position_side in data.quiet_sides:
             return None
 
         # 检查节流
-        if self._is_throttled(symbol, position_side, current_ms):
+        cfg = data.cfg
+        key = (symbol, position_side)
+        if self._is_throttled(key, cfg.min_signal_interval_ms, current_ms):
             return None
 
         # 检查仓位是否有效（非零）
-        if abs(position.position_amt) == Decimal("0"):
+        if position.position_amt.is_zero():
             return None
 
         # 根据仓位方向检查退出条件
@@ -194,16 +290,16 @@ class SignalEngine:
             reason = self._check_short_exit(state)
 
         if reason is None:
+            data.quiet_sides.add(position_side)
             return None
 
-        ret_window = self._compute_accel_ret(symbol, current_ms, state.last_trade_price)
-        accel_mult = self._select_accel_mult(symbol, position_side, ret_window)
+        ret_window = self._compute_accel_ret(data.history, current_ms, state.last_trade_price, cfg.accel_window_ms)
+        accel_mult = self._select_accel_mult(cfg, position_side, ret_window)
 
         roi = self._compute_roi(position)
-        roi_mult = self._select_roi_mult(symbol, roi)
+        roi_mult = self._select_roi_mult(cfg, roi)
 
         # 更新最后信号时间
-        key = f"{symbol}:{position_side.value}"
         self._last_signal_ms[key] = current_ms
 
         # 创建 ExitSignal
@@ -254,23 +350,22 @@ class SignalEngine:
         Returns:
             SignalReason 或 None
         """
-        if state.previous_trade_price is None:
-            return None
-
         last = state.last_trade_price
         prev = state.previous_trade_price
+        if prev is None:
+            return None
         best_bid = state.best_bid
 
-        # Primary condition: 价格上涨 AND 买一支撑当前价
-        long_primary = last > prev and best_bid >= last
+        # 两个条件都要求买一支撑当前价：不满足时直接返回（最常见的无信号路径只做一次比较）
+        if best_bid < last:
+            return None
 
-        if long_primary:
+        # Primary condition: 价格上涨 AND 买一支撑当前价
+        if last > prev:
             return SignalReason.LONG_PRIMARY
 
         # Bid improve condition: 买一支撑当前价 AND 买一比上一成交价高
-        long_bid_improve = best_bid >= last and best_bid > prev
-
-        if long_bid_improve:
+        if best_bid > prev:
             return SignalReason.LONG_BID_IMPROVE
 
         return None
@@ -289,59 +384,51 @@ class SignalEngine:
         Returns:
             SignalReason 或 None
         """
-        if state.previous_trade_price is None:
-            return None
-
         last = state.last_trade_price
         prev = state.previous_trade_price
+        if prev is None:
+            return None
         best_ask = state.best_ask
 
-        # Primary condition: 价格下跌 AND 卖一压低到当前价
-        short_primary = last < prev and best_ask <= last
+        # 两个条件都要求卖一压低到当前价：不满足时直接返回（最常见的无信号路径只做一次比较）
+        if best_ask > last:
+            return None
 
-        if short_primary:
+        # Primary condition: 价格下跌 AND 卖一压低到当前价
+        if last < prev:
             return SignalReason.SHORT_PRIMARY
 
         # Ask improve condition: 卖一压低到当前价 AND 卖一比上一成交价低
-        short_ask_improve = best_ask <= last and best_ask < prev
-
-        if short_ask_improve:
+        if best_ask < prev:
             return SignalReason.SHORT_ASK_IMPROVE
 
         return None
 
-    def _is_throttled(self, symbol: str, position_side: PositionSide, current_ms: int) -> bool:
+    def _is_throttled(self, key: Tuple[str, PositionSide], interval_ms: int, current_ms: int) -> bool:
         """
         检查是否在节流期内
 
         Args:
-            symbol: 交易对
-            position_side: 仓位方向
+            key: (symbol, position_side)
+            interval_ms: 该 symbol 的最小信号间隔
             current_ms: 当前时间戳
 
         Returns:
             True 如果在节流期内
         """
-        key = f"{symbol}:{position_side.value}"
         last_signal_ms = self._last_signal_ms.get(key, 0)
+        return last_signal_ms != 0 and current_ms - last_signal_ms < interval_ms
 
-        if last_signal_ms == 0:
-            return False
-
-        elapsed = current_ms - last_signal_ms
-        interval = self._symbol_min_signal_interval_ms.get(symbol, self.min_signal_interval_ms)
-        return elapsed < interval
-
-    def _compute_accel_ret(self, symbol: str, current_ms: int, last_price: Decimal) -> Optional[Decimal]:
+    def _compute_accel_ret(
+        self, history: Deque[Tuple[int, Decimal]], current_ms: int, last_price: Decimal, window_ms: int
+    ) -> Optional[Decimal]:
         """计算滑动窗口回报率 ret = p_now/p_window_ago - 1（基于 last_trade_price）。"""
-        if last_price <= Decimal("0"):
+        if last_price <= _D0:
             return None
 
-        history = self._trade_history.get(symbol)
-        if not history or len(history) < 2:
+        if not history:
             return None
 
-        window_ms = self._symbol_accel_window_ms.get(symbol, 2000)
         cutoff = current_ms - window_ms
 
         # 移除窗口外数据（保留窗口内最早点作为 window_ago 近似）
@@ -352,59 +439,42 @@ class SignalEngine:
             return None
 
         window_price = history[0][1]
-        if window_price <= Decimal("0"):
+        if window_price <= _D0:
             return None
 
-        return (last_price / window_price) - Decimal("1")
+        return (last_price / window_price) - _D1
 
     def _select_accel_mult(
-        self, symbol: str, position_side: PositionSide, ret_window: Optional[Decimal]
+        self, cfg: _SymbolSignalConfig, position_side: PositionSide, ret_window: Optional[Decimal]
     ) -> int:
         """按档位选择 accel_mult（取满足条件的最高档）。LONG/SHORT 共用 tiers，方向自动处理。"""
         if ret_window is None:
             return 1
 
-        tiers = self._symbol_accel_tiers.get(symbol, [])
-
-        best_mult = 1
-        for threshold, mult in tiers:
-            candidate = max(int(mult), 1)
-            if position_side == PositionSide.LONG:
-                if ret_window >= threshold:
-                    best_mult = max(best_mult, candidate)
-            else:
-                if ret_window <= -threshold:
-                    best_mult = max(best_mult, candidate)
-        return best_mult
+        value = ret_window if position_side == PositionSide.LONG else -ret_window
+        return _select_tier_mult(cfg.accel_thresholds, cfg.accel_mults, value)
 
     def _compute_roi(self, position: Position) -> Optional[Decimal]:
         """计算该侧仓位 ROI（以初始保证金为分母的比例值）。"""
-        qty = abs(position.position_amt)
-        if qty <= Decimal("0"):
+        if position.position_amt.is_zero():
             return None
-        if position.entry_price <= Decimal("0"):
+        if position.entry_price <= _D0:
             return None
 
         leverage = position.leverage if position.leverage > 0 else 1
-        notional = qty * position.entry_price
+        notional = abs(position.position_amt) * position.entry_price
         initial_margin = notional / Decimal(leverage)
-        if initial_margin <= Decimal("0"):
+        if initial_margin <= _D0:
             return None
 
         return position.unrealized_pnl / initial_margin
 
-    def _select_roi_mult(self, symbol: str, roi: Optional[Decimal]) -> int:
+    def _select_roi_mult(self, cfg: _SymbolSignalConfig, roi: Optional[Decimal]) -> int:
         """按档位选择 roi_mult（取满足条件的最高档）。"""
         if roi is None:
             return 1
 
-        tiers = self._symbol_roi_tiers.get(symbol, [])
-        best_mult = 1
-        for threshold, mult in tiers:
-            candidate = max(int(mult), 1)
-            if roi >= threshold:
-                best_mult = max(best_mult, candidate)
-        return best_mult
+        return _select_tier_mult(cfg.roi_thresholds, cfg.roi_mults, roi)
 
     def get_market_state(self, symbol: str) -> Optional[MarketState]:
         """
@@ -416,7 +486,8 @@ class SignalEngine:
         Returns:
             MarketState 或 None
         """
-        return self._market_states.get(symbol)
+        data = self._market_data.get(symbol)
+        return data.state if data is not None else None
 
     def is_data_ready(self, symbol: str) -> bool:
         """
@@ -428,8 +499,8 @@ class SignalEngine:
         Returns:
             True 如果数据就绪
         """
-        state = self._market_states.get(symbol)
-        return state is not None and state.is_ready
+        data = self._market_data.get(symbol)
+        return data is not None and data.state.is_ready
 
     def reset_throttle(self, symbol: str, position_side: PositionSide) -> None:
         """
@@ -439,7 +510,7 @@ class SignalEngine:
             symbol: 交易对
             position_side: 仓位方向
         """
-        key = f"{symbol}:{position_side.value}"
+        key = (symbol, position_side)
         if key in self._last_signal_ms:
             del self._last_signal_ms[key]
         if key in self._last_logged_signal:
@@ -452,20 +523,14 @@ class SignalEngine:
         Args:
             symbol: 交易对
         """
-        if symbol in self._market_states:
-            del self._market_states[symbol]
-        if symbol in self._has_book_data:
-            del self._has_book_data[symbol]
-        if symbol in self._has_trade_data:
-            del self._has_trade_data[symbol]
-        if symbol in self._trade_history:
-            del self._trade_history[symbol]
+        if symbol in self._market_data:
+            del self._market_data[symbol]
 
         # 清除相关的节流记录
-        keys_to_remove = [k for k in self._last_signal_ms if k.startswith(f"{symbol}:")]
+        keys_to_remove = [k for k in self._last_signal_ms if k[0] == symbol]
         for key in keys_to_remove:
             del self._last_signal_ms[key]
 
-        keys_to_remove = [k for k in self._last_logged_signal if k.startswith(f"{symbol}:")]
+        keys_to_remove = [k for k in self._last_logged_signal if k[0] == symbol]
         for key in keys_to_remove:
             del self._last_logged_signal[key]
@@ -42,7 +42,7 @@ from src.utils.helpers import (
     ws_stream_to_symbol,
 )
 
-__all__ = [
+__all__ = (
     # 日志
     "setup_logger",
     "get_logger",
@@ -70,4 +70,4 @@ __all__ = [
     # Symbol 转换
     "symbol_to_ws_stream",
     "ws_stream_to_symbol",
-]
+)
@@ -1,6 +1,6 @@
 # Input: log dir and normalized event fields
-# Output: configured logger and structured logging helpers
-# Pos: logging setup and event normalization (including fill roles)
+# Output: configured logger (returns current log file path) and structured logging helpers
+# Pos: logging setup and event normalization (including fill roles, level gate before formatting, cached Decimal text)
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
@@ -17,6 +17,8 @@
 """
 
 import sys
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Any
 from decimal import Decimal
@@ -32,6 +34,21 @@ logger.remove()
 # 全局 logger 实例
 _logger = logger
 
+# log_event 的 level 参数 → loguru 级别数值
+_LEVEL_NO = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+# log_event 字段名缩短（保持日志简洁）
+_FIELD_RENAMES = (
+    ("best_bid", "bid"),
+    ("best_ask", "ask"),
+    ("last_trade", "last"),
+    ("filled_qty", "filled"),
+    ("position_amt", "pos"),
+)
+
+# 当前所有 sink 的最低级别（setup_logger 维护）；低于该级别的事件在构建消息前直接丢弃
+_min_levelno = 0
+
 
 EVENT_TYPE_CN = {
     "startup": "启动",
@@ -65,7 +82,7 @@ def setup_logger(
     rotation: str = "00:00",  # 每天零点滚动
     retention: str = "30 days",
     console: bool = True,
-) -> None:
+) -> Path:
     """
     配置日志系统
 
@@ -75,8 +92,11 @@ def setup_logger(
         rotation: 滚动策略（默认每天零点）
         retention: 保留时间（默认 30 天）
         console: 是否输出到控制台
+
+    Returns:
+        当前主日志文件路径（loguru 添加 sink 时按本地日期创建的文件；滚动后不再更新）
     """
-    global _logger
+    global _logger, _min_levelno
 
     effective_file_level = file_level or level
 
@@ -111,8 +131,10 @@ def setup_logger(
             colorize=True,
         )
 
-    # 文件输出 - 按天滚动
+    # 文件输出 - 按天滚动（loguru 按本地时间解析 {time}，add 时即创建文件）
     log_file = log_dir / "vibe-quant_{time:YYYY-MM-DD}.log"
+    # {time} 在 add 内部取值：前后各取一次日期夹住它，跨零点时以实际创建的文件为准
+    date_before = datetime.now().date()
     _logger.add(
         str(log_file),
         format=file_format,
@@ -122,6 +144,10 @@ def setup_logger(
         compression="gz",  # 压缩旧日志
         encoding="utf-8",
     )
+    date_after = datetime.now().date()
+    current_log_file = log_dir / f"vibe-quant_{date_after:%Y-%m-%d}.log"
+    if date_after != date_before and not current_log_file.exists():
+        current_log_file = log_dir / f"vibe-quant_{date_before:%Y-%m-%d}.log"
 
     # 错误日志单独文件
     error_file = log_dir / "error_{time:YYYY-MM-DD}.log"
@@ -135,6 +161,11 @@ def setup_logger(
         encoding="utf-8",
     )
 
+    # 错误日志 sink 固定为 ERROR，不会低于其余 sink
+    _min_levelno = _logger.level(effective_file_level).no
+    if console:
+        _min_levelno = min(_min_levelno, _logger.level(level).no)
+
     if console:
         _logger.info(
             f"日志系统初始化完成，目录: {log_dir}, 控制台级别: {level}, 文件级别: {effective_file_level}"
@@ -144,32 +175,44 @@ def setup_logger(
             f"日志系统初始化完成，目录: {log_dir}, 文件级别: {effective_file_level}"
         )
 
+    return current_log_file
+
 
 def get_logger():
     """获取 logger 实例"""
     return _logger
 
 
+@lru_cache(maxsize=4096)
+def _format_decimal_cached(value: Decimal) -> str:
+    """Decimal 格式化（缓存：数量/tick/价格在日志中高度重复；相等的 Decimal 格式化结果一致）"""
+    return format_decimal(value) or ""
+
+
 def _format_value(value: Any) -> str:
     """格式化值为字符串"""
     if value is None:
         return ""
     if isinstance(value, Decimal):
-        return format_decimal(value) or ""
+        return _format_decimal_cached(value)
     return str(value)
 
 
 def _build_extra_fields(**kwargs) -> str:
     """构建额外字段字符串，cn 字段始终在最前面且不带 key"""
-    fields = []
-    # cn 字段优先，且直接显示值（不带 cn=）
-    if "cn" in kwargs and kwargs["cn"] is not None:
-        fields.append(str(kwargs["cn"]))
-    # 其他字段
+    # cn 字段优先，且直接显示值（不带 cn=）；kwargs 是本次调用的新 dict，可直接 pop
+    cn = kwargs.pop("cn", None)
+    fields = [] if cn is None else [str(cn)]
+    append = fields.append
+    # 其他字段（内联 _format_value，省去逐字段函数调用）
     for key, value in kwargs.items():
-        if key != "cn" and value is not None:
-            fields.append(f"{key}={_format_value(value)}")
-    return " | ".join(fields) if fields else ""
+        if value is None:
+            continue
+        if isinstance(value, Decimal):
+            append(f"{key}={_format_decimal_cached(value)}")
+        else:
+            append(f"{key}={value!s}")
+    return " | ".join(fields)
 
 
 def log_event(event_type: str, *, level: str | None = None, **fields) -> None:
@@ -187,6 +230,27 @@ def log_event(event_type: str, *, level: str | None = None, **fields) -> None:
             - position_amt → pos
     """
     normalized_event_type = event_type.lower()
+
+    # 先确定日志级别（level 参数可覆盖），会被所有 sink 丢弃的事件不再构建消息
+    if level not in _LEVEL_NO:
+        if event_type == "error" or fields.get("error"):
+            level = "error"
+        elif event_type in (
+            "ws_disconnect",
+            "ws_reconnect",
+            "timeout",
+            "risk",
+            "rate_limit",
+            "reject",
+        ):
+            level = "warning"
+        elif event_type in ("market_update",):
+            level = "debug"
+        else:
+            level = "info"
+    if _LEVEL_NO[level] < _min_levelno:
+        return
+
     event_cn = EVENT_TYPE_CN.get(normalized_event_type)
 
     # event_cn 统一转为 cn
@@ -198,25 +262,14 @@ def log_event(event_type: str, *, level: str | None = None, **fields) -> None:
         fields["cn"] = event_cn
 
     # 字段名缩短（保持日志简洁）
-    field_renames = {
-        "best_bid": "bid",
-        "best_ask": "ask",
-        "last_trade": "last",
-        "filled_qty": "filled",
-        "position_amt": "pos",
-    }
-    for old_name, new_name in field_renames.items():
+    for old_name, new_name in _FIELD_RENAMES:
         if old_name in fields:
             fields[new_name] = fields.pop(old_name)
 
     # symbol 简写：ZEN/USDT:USDT → ZEN
-    if "symbol" in fields and fields["symbol"]:
-        symbol = str(fields["symbol"])
-        if "/" in symbol:
-            fields["symbol"] = symbol.split("/")[0]
-
-    # 提取 error 字段用于日志级别判断
-    error = fields.get("error")
+    symbol = fields.get("symbol")
+    if symbol:
+        fields["symbol"] = str(symbol).partition("/")[0]
 
     # 构建日志消息
     fields_str = _build_extra_fields(**fields)
@@ -224,32 +277,14 @@ def log_event(event_type: str, *, level: str | None = None, **fields) -> None:
     if fields_str:
         message = f"{message} {fields_str}"
 
-    # 根据事件类型选择日志级别（level 参数可覆盖）
     if level == "debug":
         _logger.debug(message)
     elif level == "info":
         _logger.info(message)
     elif level == "warning":
         _logger.warning(message)
-    elif level == "error":
-        _logger.error(message)
-    elif event_type == "error" or error:
-        _logger.error(message)
-    elif event_type in (
-        "ws_disconnect",
-        "ws_reconnect",
-        "timeout",
-        "risk",
-        "rate_limit",
-        "reject",
-    ):
-        _logger.warning(message)
-    elif event_type in ("startup", "shutdown", "signal", "fill"):
-        _logger.info(message)
-    elif event_type in ("market_update",):
-        _logger.debug(message)
     else:
-        _logger.info(message)
+        _logger.error(message)
 
 
 # 便捷函数
@@ -1,17 +1,30 @@
 # Input: market/user WS clients
-# Output: ws exports
+# Output: ws exports (lazy via src._lazy)
 # Pos: ws package initializer
 # 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
 
 """
 WebSocket 模块
 
-导出：
+导出（按需加载）：
 - MarketWSClient: 市场数据 WS 客户端
 - UserDataWSClient: User Data Stream 客户端
 """
 
-from src.ws.market import MarketWSClient
-from src.ws.user_data import UserDataWSClient
+from typing import TYPE_CHECKING
 
-__all__ = ["MarketWSClient", "UserDataWSClient"]
+from src._lazy import install
+
+if TYPE_CHECKING:
+    from src.ws.market import MarketWSClient
+    from src.ws.user_data import UserDataWSClient
+
+__all__ = (
+    "MarketWSClient",
+    "UserDataWSClient",
+)
+
+install(globals(), {
+    "MarketWSClient": ("src.ws.market", "MarketWSClient"),
+    "UserDataWSClient": ("src.ws.user_data", "UserDataWSClient"),
+})
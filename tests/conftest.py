@@ -0,0 +1,40 @@
+# Input: loguru logger
+# Output: 会话级共享夹具（内存空 sink 日志初始化与恢复）
+# Pos: tests 全局 conftest
+# 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
+
+"""
+测试全局夹具
+
+测试不读取日志输出：会话开始时只挂一个内存空 sink，不创建任何日志文件。
+空 sink 取 DEBUG 级，log_event 的格式化路径照常执行。
+需要断言文件/目录创建的测试自行调用 setup_logger，并使用 restore_null_logger 恢复。
+"""
+
+import pytest
+
+import src.utils.logger as logger_module
+from src.utils.logger import get_logger
+
+
+def _install_null_sink() -> None:
+    """loguru 只保留一个空 sink（DEBUG 级：照常格式化但不落盘）"""
+    logger = get_logger()
+    logger.remove()
+    logger.add(lambda _message: None, level="DEBUG")
+    # 与 setup_logger 一致：最低 sink 级别为 DEBUG，不跳过任何事件
+    logger_module._min_levelno = 0
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_logger_for_tests():
+    """会话级设置 logger（内存空 sink）"""
+    _install_null_sink()
+    yield
+
+
+@pytest.fixture
+def restore_null_logger():
+    """测试内自行调用 setup_logger 时使用：结束后恢复会话级空 sink"""
+    yield
+    _install_null_sink()
@@ -10,8 +10,6 @@
 import pytest
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
-from tempfile import TemporaryDirectory
-from pathlib import Path
 
 from src.exchange.adapter import ExchangeAdapter
 from src.models import (
@@ -25,15 +23,6 @@ from src.models import (
     OrderIntent,
     OrderResult,
 )
-from src.utils.logger import setup_logger
-
-
-@pytest.fixture(autouse=True)
-def setup_logger_for_tests():
-    """每个测试前设置 logger"""
-    with TemporaryDirectory() as tmpdir:
-        setup_logger(Path(tmpdir), console=False)
-        yield
 
 
 class TestExchangeAdapterInit:
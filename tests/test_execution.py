@@ -9,8 +9,6 @@
 
 import pytest
 from decimal import Decimal
-from tempfile import TemporaryDirectory
-from pathlib import Path
 from unittest.mock import AsyncMock
 
 from src.execution.engine import ExecutionEngine
@@ -30,15 +28,6 @@ from src.models import (
     MarketState,
     SymbolRules,
 )
-from src.utils.logger import setup_logger
-
-
-@pytest.fixture(autouse=True)
-def setup_logger_for_tests():
-    """每个测试前设置 logger"""
-    with TemporaryDirectory() as tmpdir:
-        setup_logger(Path(tmpdir), console=False)
-        yield
 
 
 @pytest.fixture
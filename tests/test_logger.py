@@ -9,10 +9,11 @@
 
 import os
 import pytest
-from pathlib import Path
-from tempfile import TemporaryDirectory
+from datetime import datetime, timedelta
 from decimal import Decimal
 
+import src.utils.logger as logger_module
+from src.models import PositionSide
 from src.utils.logger import (
     setup_logger,
     get_logger,
@@ -35,29 +36,45 @@ from src.utils.logger import (
 )
 
 
+@pytest.mark.usefixtures("restore_null_logger")
 class TestLoggerSetup:
     """日志设置测试"""
 
-    def test_setup_logger_creates_directory(self):
+    def test_setup_logger_creates_directory(self, tmp_path):
         """测试日志目录创建"""
-        with TemporaryDirectory() as tmpdir:
-            log_dir = Path(tmpdir) / "logs"
-            setup_logger(log_dir, console=False)
-            assert log_dir.exists()
+        log_dir = tmp_path / "logs"
+        setup_logger(log_dir, console=False)
+        assert log_dir.exists()
 
-    def test_setup_logger_creates_log_files(self):
+    def test_setup_logger_creates_log_files(self, tmp_path):
         """测试日志文件创建"""
-        with TemporaryDirectory() as tmpdir:
-            log_dir = Path(tmpdir)
-            setup_logger(log_dir, console=False)
+        log_file = setup_logger(tmp_path, console=False)
 
-            # 写入一条日志
-            logger = get_logger()
-            logger.info("test message")
+        # 写入一条日志
+        logger = get_logger()
+        logger.info("test message")
+
+        # 检查日志文件是否存在
+        assert log_file.parent == tmp_path
+        assert log_file.exists()
+        assert "test message" in log_file.read_text(encoding="utf-8")
+
+    @pytest.mark.parametrize("before_days, after_days", [(-1, 0), (0, 1)], ids=["new_day", "old_day"])
+    def test_setup_logger_returns_created_file_across_midnight(self, tmp_path, monkeypatch, before_days, after_days):
+        """add 前后跨零点时，返回 loguru 实际创建的文件（无论它落在哪一天）"""
+        today = datetime.now()
+        moments = iter([today + timedelta(days=before_days), today + timedelta(days=after_days)])
+
+        class FakeDatetime:
+            @staticmethod
+            def now():
+                return next(moments)
 
-            # 检查日志文件是否存在
-            log_files = list(log_dir.glob("vibe-quant_*.log"))
-            assert len(log_files) >= 1
+        monkeypatch.setattr(logger_module, "datetime", FakeDatetime)
+        log_file = setup_logger(tmp_path, console=False)
+
+        assert log_file == tmp_path / f"vibe-quant_{today:%Y-%m-%d}.log"
+        assert log_file.exists()
 
     def test_get_logger_returns_logger(self):
         """测试获取 logger"""
@@ -76,6 +93,12 @@ class TestHelperFunctions:
         """测试格式化 Decimal"""
         assert _format_value(Decimal("123.456")) == "123.456"
 
+    def test_format_value_decimal_equal_values_share_text(self):
+        """测试相等 Decimal（不同指数）格式化结果一致（缓存命中安全）"""
+        assert _format_value(Decimal("1.10")) == "1.1"
+        assert _format_value(Decimal("1.1")) == "1.1"
+        assert _format_value(Decimal("0.123456")) == "0.1235"
+
     def test_format_value_string(self):
         """测试格式化字符串"""
         assert _format_value("test") == "test"
@@ -95,6 +118,13 @@ class TestHelperFunctions:
         assert "b=" not in result
         assert "c=test" in result
 
+    def test_build_extra_fields_matches_format_value(self):
+        """测试内联格式化与 _format_value 一致（含 str 混入枚举、cn 置顶）"""
+        values = {"side": PositionSide.LONG, "qty": Decimal("0.10"), "n": 3, "flag": True}
+        result = _build_extra_fields(**values, cn="下单")
+        expected = ["下单"] + [f"{k}={_format_value(v)}" for k, v in values.items()]
+        assert result == " | ".join(expected)
+
     def test_build_extra_fields_multiple(self):
         """测试构建多个字段"""
         result = _build_extra_fields(symbol="BTC", side="LONG", qty=Decimal("0.1"))
@@ -106,13 +136,6 @@ class TestHelperFunctions:
 class TestLogEvent:
     """log_event 测试"""
 
-    @pytest.fixture(autouse=True)
-    def setup_logger_for_tests(self):
-        """每个测试前设置 logger"""
-        with TemporaryDirectory() as tmpdir:
-            setup_logger(Path(tmpdir), console=False)
-            yield
-
     def test_log_event_basic(self):
         """测试基本事件日志"""
         # 不应抛出异常
@@ -142,107 +165,94 @@ class TestLogEvent:
         """测试错误事件日志"""
         log_event("error", error="Connection failed", symbol="BTC/USDT:USDT")
 
+    @pytest.mark.usefixtures("restore_null_logger")
+    def test_log_event_below_min_level_skips_formatting(self, tmp_path, monkeypatch):
+        """测试低于所有 sink 级别的事件不构建消息"""
+        setup_logger(tmp_path, level="INFO", console=False)
+
+        def fail(**kwargs):
+            raise AssertionError("should not format")
+
+        monkeypatch.setattr(logger_module, "_build_extra_fields", fail)
+        # market_update 默认 debug，低于 INFO：直接丢弃
+        log_event("market_update", symbol="BTC/USDT:USDT", best_bid=Decimal("1"))
+        log_event("risk", symbol="BTC/USDT:USDT", reason="x", level="debug")
+
+        with pytest.raises(AssertionError):
+            log_event("market_update", symbol="BTC/USDT:USDT", level="info")
+
+
+_CONVENIENCE_CASES = [
+    (log_startup, {"symbols": ["BTC/USDT:USDT", "ETH/USDT:USDT"]}),
+    (log_shutdown, {"reason": "signal received"}),
+    (log_ws_connect, {"stream_type": "bookTicker"}),
+    (log_ws_disconnect, {"stream_type": "bookTicker", "reason": "connection lost"}),
+    (log_ws_reconnect, {"stream_type": "bookTicker", "attempt": 3}),
+    (
+        log_market_update,
+        {
+            "symbol": "BTC/USDT:USDT",
+            "best_bid": Decimal("50000.00"),
+            "best_ask": Decimal("50000.10"),
+            "last_trade": Decimal("50000.05"),
+        },
+    ),
+    (
+        log_signal,
+        {
+            "symbol": "BTC/USDT:USDT",
+            "side": "LONG",
+            "reason": "long_primary",
+            "best_bid": Decimal("50000.00"),
+            "best_ask": Decimal("50000.10"),
+            "last_trade": Decimal("50000.05"),
+        },
+    ),
+    (
+        log_order_place,
+        {
+            "symbol": "BTC/USDT:USDT",
+            "side": "LONG",
+            "mode": "MAKER_ONLY",
+            "qty": Decimal("0.001"),
+            "price": Decimal("50000.00"),
+            "order_id": "12345",
+        },
+    ),
+    (log_order_cancel, {"symbol": "BTC/USDT:USDT", "order_id": "12345", "reason": "timeout"}),
+    (
+        log_order_fill,
+        {
+            "symbol": "BTC/USDT:USDT",
+            "side": "LONG",
+            "order_id": "12345",
+            "filled_qty": Decimal("0.001"),
+            "avg_price": Decimal("50000.00"),
+        },
+    ),
+    (
+        log_order_timeout,
+        {"symbol": "BTC/USDT:USDT", "side": "LONG", "order_id": "12345", "timeout_count": 2},
+    ),
+    (
+        log_position_update,
+        {"symbol": "BTC/USDT:USDT", "side": "LONG", "position_amt": Decimal("0.01")},
+    ),
+    (
+        log_error,
+        {"error": "Connection timeout", "symbol": "BTC/USDT:USDT", "extra_field": "extra_value"},
+    ),
+]
+
 
 class TestConvenienceFunctions:
     """便捷函数测试"""
 
-    @pytest.fixture(autouse=True)
-    def setup_logger_for_tests(self):
-        """每个测试前设置 logger"""
-        with TemporaryDirectory() as tmpdir:
-            setup_logger(Path(tmpdir), console=False)
-            yield
-
-    def test_log_startup(self):
-        """测试启动日志"""
-        log_startup(["BTC/USDT:USDT", "ETH/USDT:USDT"])
-
-    def test_log_shutdown(self):
-        """测试关闭日志"""
-        log_shutdown("signal received")
-
-    def test_log_ws_connect(self):
-        """测试 WS 连接日志"""
-        log_ws_connect("bookTicker")
-
-    def test_log_ws_disconnect(self):
-        """测试 WS 断开日志"""
-        log_ws_disconnect("bookTicker", "connection lost")
-
-    def test_log_ws_reconnect(self):
-        """测试 WS 重连日志"""
-        log_ws_reconnect("bookTicker", 3)
-
-    def test_log_market_update(self):
-        """测试行情更新日志"""
-        log_market_update(
-            symbol="BTC/USDT:USDT",
-            best_bid=Decimal("50000.00"),
-            best_ask=Decimal("50000.10"),
-            last_trade=Decimal("50000.05"),
-        )
-
-    def test_log_signal(self):
-        """测试信号日志"""
-        log_signal(
-            symbol="BTC/USDT:USDT",
-            side="LONG",
-            reason="long_primary",
-            best_bid=Decimal("50000.00"),
-            best_ask=Decimal("50000.10"),
-            last_trade=Decimal("50000.05"),
-        )
-
-    def test_log_order_place(self):
-        """测试下单日志"""
-        log_order_place(
-            symbol="BTC/USDT:USDT",
-            side="LONG",
-            mode="MAKER_ONLY",
-            qty=Decimal("0.001"),
-            price=Decimal("50000.00"),
-            order_id="12345",
-        )
-
-    def test_log_order_cancel(self):
-        """测试撤单日志"""
-        log_order_cancel(
-            symbol="BTC/USDT:USDT",
-            order_id="12345",
-            reason="timeout",
-        )
-
-    def test_log_order_fill(self):
-        """测试成交日志"""
-        log_order_fill(
-            symbol="BTC/USDT:USDT",
-            side="LONG",
-            order_id="12345",
-            filled_qty=Decimal("0.001"),
-            avg_price=Decimal("50000.00"),
-        )
-
-    def test_log_order_timeout(self):
-        """测试超时日志"""
-        log_order_timeout(
-            symbol="BTC/USDT:USDT",
-            side="LONG",
-            order_id="12345",
-            timeout_count=2,
-        )
-
-    def test_log_position_update(self):
-        """测试仓位更新日志"""
-        log_position_update(
-            symbol="BTC/USDT:USDT",
-            side="LONG",
-            position_amt=Decimal("0.01"),
-        )
-
-    def test_log_error(self):
-        """测试错误日志"""
-        log_error(
-            error="Connection timeout",
-            symbol="BTC/USDT:USDT",
-            extra_field="extra_value",
-        )
+    @pytest.mark.parametrize(
+        "fn, kwargs",
+        _CONVENIENCE_CASES,
+        ids=[fn.__name__ for fn, _ in _CONVENIENCE_CASES],
+    )
+    def test_convenience_function_does_not_raise(self, fn, kwargs):
+        """测试便捷日志函数（不应抛出异常）"""
+        fn(**kwargs)
@@ -9,35 +9,28 @@ main.py 应用关闭行为测试
 
 import asyncio
 from pathlib import Path
-from tempfile import TemporaryDirectory
 
 import pytest
 
 from src.main import Application
-from src.utils.logger import setup_logger
-
-
-@pytest.fixture(autouse=True)
-def setup_logger_for_tests():
-    """每个测试前设置 logger"""
-    with TemporaryDirectory() as tmpdir:
-        setup_logger(Path(tmpdir), console=False)
-        yield
 
 
 class DummyWS:
     def __init__(self):
         self.connect_started = False
         self.disconnect_called = False
-        self._block = asyncio.Event()
+        # connect() 阻塞到 disconnect()；需在运行中的事件循环内构造
+        self._block: asyncio.Future[None] = asyncio.get_running_loop().create_future()
 
     async def connect(self) -> None:
         self.connect_started = True
-        await self._block.wait()
+        await self._block
 
     async def disconnect(self) -> None:
         self.disconnect_called = True
-        self._block.set()
+        # connect 任务可能已被取消（future 随之取消），此时无需再唤醒
+        if not self._block.done():
+            self._block.set_result(None)
 
 
 @pytest.mark.asyncio
@@ -64,7 +57,7 @@ async def test_run_should_exit_on_shutdown_without_blocking_ws_connect(monkeypat
     original_sleep = asyncio.sleep
 
     async def fast_sleep(delay: float, result=None):
-        await original_sleep(0)
+        # 不经过事件循环：run() 中固定等待直接跳过，让出点只保留 _shutdown_event.wait()
         return result
 
     import src.main as main_module
@@ -105,9 +98,15 @@ async def test_main_loop_spawns_side_tasks_and_shutdown_cancels_them():
     assert len(app._side_tasks) == 0
 
 
-def test_protective_stop_debounce_classification():
-    assert Application._protective_stop_debounce_s("position_update:LONG") == 1.0
-    assert Application._protective_stop_debounce_s("startup") == 0.0
-    assert Application._protective_stop_debounce_s("calibration:user_data") == 0.0
-    assert Application._protective_stop_debounce_s("order_update:FILLED") == 0.2
-    assert Application._protective_stop_debounce_s("our_algo:CANCELED") == 0.2
+@pytest.mark.parametrize(
+    "reason, expected",
+    [
+        ("position_update:LONG", 1.0),
+        ("startup", 0.0),
+        ("calibration:user_data", 0.0),
+        ("order_update:FILLED", 0.2),
+        ("our_algo:CANCELED", 0.2),
+    ],
+)
+def test_protective_stop_debounce_classification(reason, expected):
+    assert Application._protective_stop_debounce_s(reason) == expected
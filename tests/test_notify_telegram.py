@@ -8,23 +8,12 @@ Telegram 通知模块测试
 """
 
 import asyncio
-from pathlib import Path
-from tempfile import TemporaryDirectory
 from typing import Any, Dict, List, Tuple
 
 import pytest
 
 import src.notify.telegram as telegram_module
 from src.notify.telegram import TelegramNotifier
-from src.utils.logger import setup_logger
-
-
-@pytest.fixture(autouse=True)
-def setup_logger_for_tests():
-    """每个测试前设置 logger"""
-    with TemporaryDirectory() as tmpdir:
-        setup_logger(Path(tmpdir), console=False)
-        yield
 
 
 class FakeResponse:
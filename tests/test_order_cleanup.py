@@ -8,22 +8,12 @@
 """
 
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from unittest.mock import AsyncMock, call
 from typing import Any, cast
 
 import pytest
 
 from src.main import Application
-from src.utils.logger import setup_logger
-
-
-@pytest.fixture(autouse=True)
-def setup_logger_for_tests():
-    """每个测试前设置 logger"""
-    with TemporaryDirectory() as tmpdir:
-        setup_logger(Path(tmpdir), console=False)
-        yield
 
 
 class DummyExchange:
@@ -0,0 +1,243 @@
+# Input: 被测模块与 pytest 夹具
+# Output: pytest 断言结果
+# Pos: 测试用例
+# 一旦我被更新，务必更新我的开头注释，以及所属文件夹的MD。
+
+"""
+包级惰性导出测试
+"""
+
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run_python(code: str) -> str:
+    """在全新解释器中执行代码，返回 stdout（用于检查 sys.modules 初始状态）"""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+    return result.stdout.strip()
+
+
+class TestLazyInstall:
+    """src._lazy.install 测试"""
+
+    def test_install_wires_module_hooks(self):
+        """install 写入 __getattr__/__dir__，并缓存解析结果"""
+        from src._lazy import install
+
+        namespace: dict = {"__name__": "fake_pkg", "__all__": ("Decimal",)}
+        install(namespace, {"Decimal": ("decimal", "Decimal")})
+
+        assert "Decimal" in namespace["__dir__"]()
+
+        from decimal import Decimal
+
+        assert namespace["__getattr__"]("Decimal") is Decimal
+        assert namespace["Decimal"] is Decimal
+        with pytest.raises(AttributeError):
+            namespace["__getattr__"]("Missing")
+
+    def test_install_rejects_mismatched_all(self):
+        """静态 __all__ 与导出表不一致时报错"""
+        from src._lazy import install
+
+        namespace: dict = {"__name__": "fake_pkg", "__all__": ("Decimal", "Missing")}
+        with pytest.raises(ValueError):
+            install(namespace, {"Decimal": ("decimal", "Decimal")})
+
+
+class TestRootPackageExports:
+    """src 根包惰性导出测试"""
+
+    def test_import_src_does_not_load_models(self):
+        """import src 不应提前加载 src.models"""
+        code = "import sys, src; print('src.models' in sys.modules)"
+        assert _run_python(code) == "False"
+
+    def test_all_names_resolve(self):
+        """__all__ 中的每个名字都可访问，且与 src.models 中的对象一致"""
+        import src
+        import src.models as models
+
+        for name in src.__all__:
+            assert getattr(src, name) is getattr(models, name)
+
+    def test_resolved_name_cached_in_module_dict(self):
+        """首次访问后写入模块命名空间"""
+        import src
+
+        _ = src.PositionSide
+        assert "PositionSide" in vars(src)
+
+    def test_unknown_name_raises_attribute_error(self):
+        """未导出的名字抛出 AttributeError"""
+        import src
+
+        with pytest.raises(AttributeError):
+            getattr(src, "NotAName")
+
+    def test_dir_lists_exports(self):
+        """dir() 包含全部导出名"""
+        import src
+
+        assert set(src.__all__) <= set(dir(src))
+
+    def test_star_import(self):
+        """from src import * 导出全部 __all__"""
+        namespace: dict = {}
+        exec("from src import *", namespace)
+        module = importlib.import_module("src")
+        for name in module.__all__:
+            assert name in namespace
+
+
+class TestConfigPackageExports:
+    """src.config 惰性导出测试"""
+
+    def test_import_config_does_not_load_yaml(self):
+        """import src.config 不应加载 loader/yaml/pydantic"""
+        code = (
+            "import sys, src.config; "
+            "print(any(m in sys.modules for m in ('yaml', 'pydantic', 'src.config.loader')))"
+        )
+        assert _run_python(code) == "False"
+
+    def test_all_names_resolve(self):
+        """__all__ 中的每个名字都可访问"""
+        import src.config as config
+        from src.config import loader, models
+
+        for name in config.__all__:
+            expected = loader.ConfigLoader if name == "ConfigLoader" else getattr(models, name)
+            assert getattr(config, name) is expected
+
+    def test_resolved_name_bypasses_getattr(self):
+        """首次访问后写入模块 __dict__，后续访问不再进入 __getattr__"""
+        import src.config as config
+
+        first = config.AppConfig
+        assert vars(config)["AppConfig"] is first
+
+        calls = []
+        original = vars(config)["__getattr__"]
+        config.__getattr__ = lambda name: calls.append(name) or original(name)
+        try:
+            assert config.AppConfig is first
+        finally:
+            config.__getattr__ = original
+        assert calls == []
+
+    def test_unknown_name_raises_attribute_error(self):
+        """未导出的名字抛出 AttributeError"""
+        import src.config as config
+
+        with pytest.raises(AttributeError):
+            getattr(config, "NotAName")
+
+
+class TestExchangePackageExports:
+    """src.exchange 惰性导出测试"""
+
+    def test_import_exchange_does_not_load_ccxt(self):
+        """import src.exchange 不应加载 ccxt/aiohttp"""
+        code = (
+            "import sys, src.exchange; "
+            "print(any(m in sys.modules for m in ('ccxt', 'aiohttp', 'src.exchange.adapter')))"
+        )
+        assert _run_python(code) == "False"
+
+    def test_exchange_adapter_resolves(self):
+        """ExchangeAdapter 按需加载"""
+        import src.exchange as exchange
+        from src.exchange.adapter import ExchangeAdapter
+
+        assert exchange.ExchangeAdapter is ExchangeAdapter
+        assert "ExchangeAdapter" in vars(exchange)
+
+
+class TestNotifyPackageExports:
+    """src.notify 惰性导出测试"""
+
+    def test_import_notify_does_not_load_telegram(self):
+        """import src.notify 不应加载 aiohttp/telegram 实现"""
+        code = (
+            "import sys, src.notify; "
+            "print(any(m in sys.modules for m in ('aiohttp', 'src.notify.telegram')))"
+        )
+        assert _run_python(code) == "False"
+
+    def test_telegram_notifier_resolves(self):
+        """TelegramNotifier 按需加载"""
+        import src.notify as notify
+        from src.notify.telegram import TelegramNotifier
+
+        assert notify.TelegramNotifier is TelegramNotifier
+
+
+class TestExecutionPackageExports:
+    """src.execution 惰性导出测试"""
+
+    def test_import_execution_does_not_load_engine(self):
+        """import src.execution 不应加载执行引擎实现"""
+        code = "import sys, src.execution; print('src.execution.engine' in sys.modules)"
+        assert _run_python(code) == "False"
+
+    def test_execution_engine_resolves(self):
+        """ExecutionEngine 按需加载"""
+        import src.execution as execution
+        from src.execution.engine import ExecutionEngine
+
+        assert execution.ExecutionEngine is ExecutionEngine
+
+
+class TestRiskPackageExports:
+    """src.risk 惰性导出测试"""
+
+    def test_import_risk_does_not_load_managers(self):
+        """import src.risk 不应加载风控实现"""
+        code = (
+            "import sys, src.risk; "
+            "print(any(m in sys.modules for m in ('src.risk.manager', 'src.risk.protective_stop')))"
+        )
+        assert _run_python(code) == "False"
+
+    def test_managers_resolve(self):
+        """RiskManager / ProtectiveStopManager 按需加载"""
+        import src.risk as risk
+        from src.risk.manager import RiskManager
+        from src.risk.protective_stop import ProtectiveStopManager
+
+        assert risk.RiskManager is RiskManager
+        assert risk.ProtectiveStopManager is ProtectiveStopManager
+
+
+class TestWsPackageExports:
+    """src.ws 惰性导出测试"""
+
+    def test_import_ws_does_not_load_clients(self):
+        """import src.ws 不应加载 WS 客户端实现"""
+        code = (
+            "import sys, src.ws; "
+            "print(any(m in sys.modules for m in ('src.ws.market', 'src.ws.user_data')))"
+        )
+        assert _run_python(code) == "False"
+
+    def test_clients_resolve(self):
+        """MarketWSClient / UserDataWSClient 按需加载"""
+        import src.ws as ws
+        from src.ws.market import MarketWSClient
+        from src.ws.user_data import UserDataWSClient
+
+        assert ws.MarketWSClient is MarketWSClient
+        assert ws.UserDataWSClient is UserDataWSClient
@@ -7,7 +7,9 @@
 保护性止损（ProtectiveStopManager）单元测试
 """
 
+import asyncio
 from decimal import Decimal
+from functools import partial
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -27,6 +29,18 @@ from src.models import (
 from src.risk.protective_stop import ProtectiveStopManager
 
 
+@pytest.fixture
+def rules() -> SymbolRules:
+    """BTC/USDT:USDT 交易规则（每个测试新建，避免跨测试共享可变对象）"""
+    return SymbolRules(
+        symbol="BTC/USDT:USDT",
+        tick_size=Decimal("0.1"),
+        step_size=Decimal("0.001"),
+        min_qty=Decimal("0.001"),
+        min_notional=Decimal("5"),
+    )
+
+
 class TestProtectiveStopPrice:
     def test_compute_stop_price_rounding(self):
         exchange = MagicMock(spec=ExchangeAdapter)
@@ -54,10 +68,95 @@ class TestProtectiveStopPrice:
         # 100/1.01=99.0099..., SHORT 采用向下规整
         assert short_stop == Decimal("99.0")
 
+    def test_desired_stop_price_cached_until_inputs_change(self, monkeypatch):
+        exchange = MagicMock(spec=ExchangeAdapter)
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        calls = []
+        original = mgr.compute_stop_price
+
+        def counting_compute(**kwargs):
+            calls.append(kwargs)
+            return original(**kwargs)
+
+        monkeypatch.setattr(mgr, "compute_stop_price", counting_compute)
+        desired_stop_price = partial(
+            mgr._get_desired_stop_price,
+            symbol="BTC/USDT:USDT",
+            position_side=PositionSide.LONG,
+            dist_to_liq=Decimal("0.01"),
+            tick_size=Decimal("0.1"),
+        )
+
+        assert desired_stop_price(liquidation_price=Decimal("100")) == Decimal("101.1")
+        assert desired_stop_price(liquidation_price=Decimal("100")) == Decimal("101.1")
+        assert len(calls) == 1
+
+        assert desired_stop_price(liquidation_price=Decimal("90")) == Decimal("91.0")
+        assert len(calls) == 2
+
+
+class TestClientOrderIdPrefix:
+    def test_prefix_is_cached_per_symbol_side(self, monkeypatch):
+        import src.risk.protective_stop as ps_module
+
+        calls = []
+        original = ps_module.symbol_to_ws_stream
+
+        def counting_symbol_to_ws_stream(symbol):
+            calls.append(symbol)
+            return original(symbol)
+
+        monkeypatch.setattr(ps_module, "symbol_to_ws_stream", counting_symbol_to_ws_stream)
+        exchange = MagicMock(spec=ExchangeAdapter)
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+
+        first = mgr._build_client_order_id_prefix(symbol, PositionSide.LONG)
+        second = mgr._build_client_order_id_prefix(symbol, PositionSide.LONG)
+
+        assert first == second == "vq-ps-btcusdt-L"
+        assert mgr._build_client_order_id_prefix(symbol, PositionSide.SHORT) == "vq-ps-btcusdt-S"
+        assert calls == [symbol, symbol]
+
+    def test_long_symbol_prefix_is_stable_across_processes(self):
+        """超长 symbol 的前缀取 crc32 摘要（与 PYTHONHASHSEED 无关，跨进程一致）"""
+        exchange = MagicMock(spec=ExchangeAdapter)
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "VERYLONGSYMBOLNAME1000/USDT:USDT"
+
+        assert mgr._build_client_order_id_prefix(symbol, PositionSide.LONG) == "vq-ps-0ad2d70-L"
+        assert mgr._build_client_order_id_prefix(symbol, PositionSide.SHORT) == "vq-ps-0ad2d70-S"
+
+    def test_parse_side_from_cid(self):
+        exchange = MagicMock(spec=ExchangeAdapter)
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+
+        assert mgr._parse_side_from_cid(mgr.build_client_order_id(symbol, PositionSide.LONG), symbol) == PositionSide.LONG
+        assert mgr._parse_side_from_cid(mgr.build_client_order_id(symbol, PositionSide.SHORT), symbol) == PositionSide.SHORT
+        assert mgr._parse_side_from_cid("vq-ps-ethusdt-L-123", symbol) is None
+        assert mgr._parse_side_from_cid("vq-ps-btcusdt-X-123", symbol) is None
+        assert mgr._parse_side_from_cid("vq-ps-btcusdt-", symbol) is None
+        assert mgr._parse_side_from_cid(None, symbol) is None
+
+    def test_client_order_id_unique_within_same_millisecond(self, monkeypatch):
+        import src.risk.protective_stop as ps_module
+
+        monkeypatch.setattr(ps_module.time, "time_ns", lambda: 1_700_000_012_345_678_901)
+        exchange = MagicMock(spec=ExchangeAdapter)
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+
+        first = mgr.build_client_order_id(symbol, PositionSide.LONG)
+        second = mgr.build_client_order_id(symbol, PositionSide.LONG)
+
+        assert first == "vq-ps-btcusdt-L-12345"
+        assert second == "vq-ps-btcusdt-L-12346"
+
 
 @pytest.mark.asyncio
 class TestProtectiveStopSync:
-    async def test_sync_places_order_when_missing(self):
+    async def test_sync_places_order_when_missing(self, rules):
         exchange = MagicMock(spec=ExchangeAdapter)
         exchange.fetch_open_orders = AsyncMock(return_value=[])
         exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
@@ -71,13 +170,6 @@ class TestProtectiveStopSync:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.LONG: Position(
                 symbol=symbol,
@@ -106,7 +198,7 @@ class TestProtectiveStopSync:
         assert intent.stop_price == Decimal("101.1")
         assert intent.is_risk is True
 
-    async def test_sync_does_not_relax_long_stop_price(self):
+    async def test_sync_does_not_relax_long_stop_price(self, rules):
         """LONG 只允许收紧：stopPrice 不允许下调（更松/更远）。"""
         exchange = MagicMock(spec=ExchangeAdapter)
         exchange.fetch_open_orders = AsyncMock(return_value=[])
@@ -132,13 +224,6 @@ class TestProtectiveStopSync:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.LONG: Position(
                 symbol=symbol,
@@ -164,7 +249,75 @@ class TestProtectiveStopSync:
         exchange.cancel_order.assert_not_called()
         exchange.place_order.assert_not_called()
 
-    async def test_sync_does_not_relax_short_stop_price(self):
+    async def test_sync_cancels_duplicate_own_orders_concurrently(self, rules):
+        """重复的自有保护止损单并发撤销；单个撤单失败不影响其它撤单与保留单。"""
+
+        def own_order(algo_id: str) -> dict:
+            return {
+                "algoId": algo_id,
+                "clientAlgoId": f"vq-ps-btcusdt-L-{algo_id}",
+                "orderType": "STOP_MARKET",
+                "positionSide": "LONG",
+                "closePosition": True,
+                "triggerPrice": "101.1",
+            }
+
+        exchange = MagicMock(spec=ExchangeAdapter)
+        exchange.fetch_open_orders = AsyncMock(return_value=[])
+        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
+        exchange.fetch_open_algo_orders = AsyncMock(
+            return_value=[own_order("1"), own_order("2"), own_order("3")]
+        )
+        exchange.place_order = AsyncMock(
+            return_value=OrderResult(success=True, order_id="4", status=OrderStatus.NEW)
+        )
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def cancel(symbol, order_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if order_id == "2":
+                raise RuntimeError("boom")
+            return OrderResult(success=True, order_id=order_id, status=OrderStatus.CANCELED)
+
+        exchange.cancel_order = AsyncMock(side_effect=cancel)
+
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+        positions = {
+            PositionSide.LONG: Position(
+                symbol=symbol,
+                position_side=PositionSide.LONG,
+                position_amt=Decimal("0.01"),
+                entry_price=Decimal("100"),
+                unrealized_pnl=Decimal("0"),
+                leverage=10,
+                liquidation_price=Decimal("100"),
+                mark_price=Decimal("110"),
+            )
+        }
+
+        await mgr.sync_symbol(
+            symbol=symbol,
+            rules=rules,
+            positions=positions,
+            enabled=True,
+            dist_to_liq=Decimal("0.01"),
+        )
+
+        cancelled = sorted(call.args[1] for call in exchange.cancel_order.call_args_list)
+        assert cancelled == ["2", "3"]
+        assert max_in_flight == 2
+        exchange.place_order.assert_not_called()
+        state = mgr._states[(symbol, PositionSide.LONG)]
+        assert state.order_id == "1"
+
+    async def test_sync_does_not_relax_short_stop_price(self, rules):
         """SHORT 只允许收紧：stopPrice 不允许上调（更松/更远）。"""
         exchange = MagicMock(spec=ExchangeAdapter)
         exchange.fetch_open_orders = AsyncMock(return_value=[])
@@ -190,13 +343,6 @@ class TestProtectiveStopSync:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
@@ -222,7 +368,98 @@ class TestProtectiveStopSync:
         exchange.cancel_order.assert_not_called()
         exchange.place_order.assert_not_called()
 
-    async def test_sync_cancels_order_when_no_position(self):
+    async def test_sync_fetches_open_and_algo_orders_concurrently(self, rules):
+        exchange = MagicMock(spec=ExchangeAdapter)
+        algo_started = asyncio.Event()
+
+        async def fetch_raw(symbol):
+            # 若两次查询串行执行，这里会等不到 algo 查询开始
+            await asyncio.wait_for(algo_started.wait(), timeout=1)
+            return []
+
+        async def fetch_algo(symbol):
+            algo_started.set()
+            return []
+
+        exchange.fetch_open_orders_raw = AsyncMock(side_effect=fetch_raw)
+        exchange.fetch_open_algo_orders = AsyncMock(side_effect=fetch_algo)
+        exchange.fetch_open_orders = AsyncMock(return_value=[])
+        exchange.place_order = AsyncMock()
+        exchange.cancel_order = AsyncMock()
+
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+
+        result = await mgr.sync_symbol(
+            symbol=symbol,
+            rules=rules,
+            positions={},
+            enabled=True,
+            dist_to_liq=Decimal("0.01"),
+        )
+
+        assert result == {PositionSide.LONG: False, PositionSide.SHORT: False}
+        exchange.fetch_open_orders.assert_not_called()
+        exchange.place_order.assert_not_called()
+
+    async def test_concurrent_syncs_do_not_place_duplicate_orders(self, rules):
+        """锁外拉单：并发同步时，后进入锁的同步应基于最新挂单，避免重复下单。"""
+        exchange = MagicMock(spec=ExchangeAdapter)
+        open_algo_orders: list[dict] = []
+
+        async def fetch_algo(symbol):
+            await asyncio.sleep(0)
+            return list(open_algo_orders)
+
+        async def place_order(intent: OrderIntent):
+            open_algo_orders.append(
+                {
+                    "algoId": str(len(open_algo_orders) + 1),
+                    "clientAlgoId": intent.client_order_id,
+                    "orderType": "STOP_MARKET",
+                    "positionSide": intent.position_side.value,
+                    "triggerPrice": str(intent.stop_price),
+                    "closePosition": True,
+                }
+            )
+            return OrderResult(success=True, order_id=str(len(open_algo_orders)), status=OrderStatus.NEW)
+
+        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
+        exchange.fetch_open_orders = AsyncMock(return_value=[])
+        exchange.fetch_open_algo_orders = AsyncMock(side_effect=fetch_algo)
+        exchange.place_order = AsyncMock(side_effect=place_order)
+        exchange.cancel_order = AsyncMock()
+
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+        positions = {
+            PositionSide.LONG: Position(
+                symbol=symbol,
+                position_side=PositionSide.LONG,
+                position_amt=Decimal("0.01"),
+                entry_price=Decimal("100"),
+                unrealized_pnl=Decimal("0"),
+                leverage=10,
+                liquidation_price=Decimal("100"),
+                mark_price=Decimal("110"),
+            )
+        }
+
+        async def sync():
+            await mgr.sync_symbol(
+                symbol=symbol,
+                rules=rules,
+                positions=positions,
+                enabled=True,
+                dist_to_liq=Decimal("0.01"),
+            )
+
+        await asyncio.gather(sync(), sync())
+
+        exchange.place_order.assert_called_once()
+        exchange.cancel_order.assert_not_called()
+
+    async def test_sync_cancels_order_when_no_position(self, rules):
         exchange = MagicMock(spec=ExchangeAdapter)
         symbol = "BTC/USDT:USDT"
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
@@ -256,14 +493,6 @@ class TestProtectiveStopSync:
             return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
         )
 
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
-
         await mgr.sync_symbol(
             symbol=symbol,
             rules=rules,
@@ -275,7 +504,41 @@ class TestProtectiveStopSync:
         exchange.cancel_order.assert_called_once_with(symbol, "123")
         exchange.place_order.assert_not_called()
 
-    async def test_sync_skips_when_external_close_position_algo_exists(self):
+    async def test_sync_cancels_pending_fetch_when_other_fetch_fails(self, rules):
+        """openOrders 拉取失败时取消仍在进行的 algo 拉取，本次同步放弃"""
+        algo_cancelled = asyncio.Event()
+
+        async def hanging_algo_fetch(_symbol):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                algo_cancelled.set()
+                raise
+
+        exchange = MagicMock(spec=ExchangeAdapter)
+        exchange.fetch_open_orders = AsyncMock(side_effect=RuntimeError("boom"))
+        exchange.fetch_open_orders_raw = AsyncMock(side_effect=RuntimeError("boom"))
+        exchange.fetch_open_algo_orders = AsyncMock(side_effect=hanging_algo_fetch)
+        exchange.place_order = AsyncMock()
+        exchange.cancel_order = AsyncMock()
+
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+
+        result = await mgr.sync_symbol(
+            symbol=symbol,
+            rules=rules,
+            positions={},
+            enabled=True,
+            dist_to_liq=Decimal("0.01"),
+        )
+
+        assert result == {PositionSide.LONG: False, PositionSide.SHORT: False}
+        await asyncio.wait_for(algo_cancelled.wait(), timeout=1)
+        exchange.place_order.assert_not_called()
+        exchange.cancel_order.assert_not_called()
+
+    async def test_sync_skips_when_external_close_position_algo_exists(self, rules):
         exchange = MagicMock(spec=ExchangeAdapter)
         exchange.fetch_open_orders = AsyncMock(return_value=[])
         exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
@@ -300,13 +563,6 @@ class TestProtectiveStopSync:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.LONG: Position(
                 symbol=symbol,
@@ -330,7 +586,59 @@ class TestProtectiveStopSync:
 
         exchange.place_order.assert_not_called()
 
-    async def test_sync_skips_when_external_reduce_only_stop_exists(self):
+    async def test_sync_treats_other_side_prefix_as_external(self, rules):
+        """cid 前缀属于 LONG、positionSide 却是 SHORT 的订单不算自有单：按外部止损处理，不撤不复用"""
+        exchange = MagicMock(spec=ExchangeAdapter)
+        exchange.fetch_open_orders = AsyncMock(return_value=[])
+        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
+        exchange.fetch_open_algo_orders = AsyncMock(
+            return_value=[
+                {
+                    "algoId": "999",
+                    "clientAlgoId": "vq-ps-btcusdt-L-123",
+                    "orderType": "STOP_MARKET",
+                    "positionSide": "SHORT",
+                    "closePosition": True,
+                    "triggerPrice": "98.9",
+                }
+            ]
+        )
+        exchange.place_order = AsyncMock(
+            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        )
+        exchange.cancel_order = AsyncMock(
+            return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
+        )
+
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+        positions = {
+            PositionSide.SHORT: Position(
+                symbol=symbol,
+                position_side=PositionSide.SHORT,
+                position_amt=Decimal("-0.01"),
+                entry_price=Decimal("100"),
+                unrealized_pnl=Decimal("0"),
+                leverage=10,
+                liquidation_price=Decimal("100"),
+                mark_price=Decimal("90"),
+            )
+        }
+
+        result = await mgr.sync_symbol(
+            symbol=symbol,
+            rules=rules,
+            positions=positions,
+            enabled=True,
+            dist_to_liq=Decimal("0.01"),
+        )
+
+        assert result[PositionSide.SHORT] is True
+        exchange.cancel_order.assert_not_called()
+        exchange.place_order.assert_not_called()
+        assert (symbol, PositionSide.SHORT) not in mgr._states
+
+    async def test_sync_skips_when_external_reduce_only_stop_exists(self, rules):
         exchange = MagicMock(spec=ExchangeAdapter)
         exchange.fetch_open_orders = AsyncMock(
             return_value=[
@@ -362,13 +670,6 @@ class TestProtectiveStopSync:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
@@ -392,7 +693,7 @@ class TestProtectiveStopSync:
 
         exchange.place_order.assert_not_called()
 
-    async def test_sync_logs_when_multiple_external_stops_exist(self, monkeypatch):
+    async def test_sync_logs_when_multiple_external_stops_exist(self, rules, monkeypatch):
         events: list[dict] = []
 
         def fake_log_event(*_args, **kwargs):
@@ -420,13 +721,6 @@ class TestProtectiveStopSync:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
@@ -451,7 +745,7 @@ class TestProtectiveStopSync:
         assert any(e.get("reason") == "external_stop_multiple" and e.get("count") == 2 for e in events)
         exchange.place_order.assert_not_called()
 
-    async def test_sync_startup_logs_existing_external_stop(self, monkeypatch):
+    async def test_sync_startup_logs_existing_external_stop(self, rules, monkeypatch):
         """启动同步时，若已存在外部 closePosition 条件单，应打印一次可读日志。"""
         events: list[dict] = []
 
@@ -484,13 +778,6 @@ class TestProtectiveStopSync:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.LONG: Position(
                 symbol=symbol,
@@ -517,7 +804,18 @@ class TestProtectiveStopSync:
         exchange.place_order.assert_not_awaited()
         exchange.place_order.assert_not_called()
 
-    async def test_sync_cancels_own_order_when_external_close_position_exists(self):
+        # 同一 symbol+side 的 startup 快照只打印一次
+        await mgr.sync_symbol(
+            symbol=symbol,
+            rules=rules,
+            positions=positions,
+            enabled=True,
+            dist_to_liq=Decimal("0.01"),
+            sync_reason="startup",
+        )
+        assert sum(1 for e in events if e.get("reason") == "startup_existing_external_stop") == 1
+
+    async def test_sync_cancels_own_order_when_external_close_position_exists(self, rules):
         exchange = MagicMock(spec=ExchangeAdapter)
         symbol = "BTC/USDT:USDT"
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
@@ -562,13 +860,6 @@ class TestProtectiveStopSync:
             return_value=OrderResult(success=True, order_id="123", status=OrderStatus.CANCELED)
         )
 
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.LONG: Position(
                 symbol=symbol,
@@ -653,7 +944,7 @@ class TestProtectiveStopSync:
         exchange.cancel_order.assert_not_called()
         exchange.place_order.assert_not_called()
 
-    async def test_sync_skips_when_ws_external_hint_active(self):
+    async def test_sync_skips_when_ws_external_hint_active(self, rules):
         """外部接管锁存时，不应下我们自己的保护止损。"""
         exchange = MagicMock(spec=ExchangeAdapter)
         exchange.fetch_open_orders = AsyncMock(return_value=[])
@@ -665,13 +956,6 @@ class TestProtectiveStopSync:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.LONG: Position(
                 symbol=symbol,
@@ -696,7 +980,7 @@ class TestProtectiveStopSync:
 
         exchange.place_order.assert_not_called()
 
-    async def test_sync_does_not_modify_existing_order_during_ws_hint(self):
+    async def test_sync_does_not_modify_existing_order_during_ws_hint(self, rules):
         """外部接管锁存时，已有我们自己的保护止损单应短暂保留，不撤不建。"""
         exchange = MagicMock(spec=ExchangeAdapter)
         exchange.fetch_open_orders = AsyncMock(return_value=[])
@@ -725,13 +1009,6 @@ class TestProtectiveStopSync:
             return_value=OrderResult(success=True, order_id="999", status=OrderStatus.CANCELED)
         )
 
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
@@ -757,6 +1034,66 @@ class TestProtectiveStopSync:
         exchange.cancel_order.assert_not_called()
         exchange.place_order.assert_not_called()
 
+    async def test_repeated_position_update_sync_always_checks_rest(self, rules):
+        """外部接管期间重复的 position_update 同步仍拉单：不会缓存“外部止损不存在”的结果"""
+        exchange = MagicMock(spec=ExchangeAdapter)
+        exchange.fetch_open_orders = AsyncMock(return_value=[])
+        exchange.fetch_open_orders_raw = AsyncMock(return_value=[])
+        exchange.fetch_open_algo_orders = AsyncMock(return_value=[])
+        exchange.place_order = AsyncMock(
+            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.NEW)
+        )
+        exchange.cancel_order = AsyncMock(
+            return_value=OrderResult(success=True, order_id="1", status=OrderStatus.CANCELED)
+        )
+
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        symbol = "BTC/USDT:USDT"
+        positions = {
+            PositionSide.LONG: Position(
+                symbol=symbol,
+                position_side=PositionSide.LONG,
+                position_amt=Decimal("0.01"),
+                entry_price=Decimal("100"),
+                unrealized_pnl=Decimal("0"),
+                leverage=10,
+                liquidation_price=Decimal("100"),
+                mark_price=Decimal("110"),
+            )
+        }
+
+        async def sync(latch: bool) -> dict:
+            return await mgr.sync_symbol(
+                symbol=symbol,
+                rules=rules,
+                positions=positions,
+                enabled=True,
+                dist_to_liq=Decimal("0.01"),
+                external_stop_latch_by_side={PositionSide.LONG: latch},
+                sync_reason="position_update:LONG",
+            )
+
+        # 先挂上自己的止损，再进入外部接管（latch 生效）且未看到外部止损
+        await sync(latch=False)
+        exchange.place_order.assert_called_once()
+        result = await sync(latch=True)
+        assert result[PositionSide.LONG] is False
+
+        # 输入完全相同，但交易所上已出现外部止损：必须如实返回，供接管 verify/release 判断
+        exchange.fetch_open_algo_orders.return_value = [
+            {
+                "algoId": "999",
+                "clientAlgoId": "external-stop-abc",
+                "orderType": "STOP_MARKET",
+                "positionSide": "LONG",
+                "closePosition": True,
+                "triggerPrice": "101.1",
+            }
+        ]
+        result = await sync(latch=True)
+        assert exchange.fetch_open_algo_orders.call_count == 3
+        assert result[PositionSide.LONG] is True
+
 
 class TestOnAlgoOrderUpdate:
     """测试 on_algo_order_update 方法（清理本地状态）。"""
@@ -960,7 +1297,7 @@ class TestStopPriceValidation:
 class TestInvalidExternalStop:
     """无效外部止损场景测试"""
 
-    async def test_cancels_invalid_external_short_stop(self, monkeypatch):
+    async def test_cancels_invalid_external_short_stop(self, rules, monkeypatch):
         """SHORT 外部止损价高于爆仓价时，取消外部止损并由程序接管"""
         events: list[dict] = []
 
@@ -992,13 +1329,6 @@ class TestInvalidExternalStop:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
@@ -1027,7 +1357,7 @@ class TestInvalidExternalStop:
         # 应该有 cancel_invalid_external_stop 日志
         assert any(e.get("reason") == "cancel_invalid_external_stop" for e in events)
 
-    async def test_valid_external_keeps_takeover(self, monkeypatch):
+    async def test_valid_external_keeps_takeover(self, rules, monkeypatch):
         """存在有效外部止损时保持外部接管（仅清理无效单）"""
         events: list[dict] = []
 
@@ -1066,13 +1396,6 @@ class TestInvalidExternalStop:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
@@ -1098,7 +1421,7 @@ class TestInvalidExternalStop:
         exchange.place_order.assert_not_called()
         assert any(e.get("reason") == "cancel_invalid_external_stop" for e in events)
 
-    async def test_invalid_external_ignores_latch(self, monkeypatch):
+    async def test_invalid_external_ignores_latch(self, rules, monkeypatch):
         """无效外部止损在锁存期内也应允许接管"""
         events: list[dict] = []
 
@@ -1130,13 +1453,6 @@ class TestInvalidExternalStop:
 
         mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
         symbol = "BTC/USDT:USDT"
-        rules = SymbolRules(
-            symbol=symbol,
-            tick_size=Decimal("0.1"),
-            step_size=Decimal("0.001"),
-            min_qty=Decimal("0.001"),
-            min_notional=Decimal("5"),
-        )
         positions = {
             PositionSide.SHORT: Position(
                 symbol=symbol,
@@ -1162,3 +1478,23 @@ class TestInvalidExternalStop:
         exchange.cancel_order.assert_called()
         exchange.place_order.assert_called()
         assert any(e.get("reason") == "cancel_invalid_external_stop" for e in events)
+
+
+class TestExtractStopPrice:
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            (Decimal("101.1"), Decimal("101.1")),
+            (101, Decimal("101")),
+            (101.1, Decimal("101.1")),
+            ("101.1", Decimal("101.1")),
+            ("0", None),
+            (Decimal("-1"), None),
+            ("bad", None),
+            (True, None),
+        ],
+    )
+    def test_extract_stop_price_input_types(self, raw, expected):
+        exchange = MagicMock(spec=ExchangeAdapter)
+        mgr = ProtectiveStopManager(exchange, client_order_id_prefix="vq-ps-")
+        assert mgr._extract_stop_price({"triggerPrice": raw}) == expected
@@ -9,6 +9,8 @@ RiskManager 测试
 
 from decimal import Decimal
 
+import pytest
+
 from src.models import Position, PositionSide
 from src.risk.manager import RiskManager
 
@@ -63,20 +65,44 @@ class TestRiskDistance:
 
 
 class TestGlobalRateLimit:
-    def test_order_rate_limit(self) -> None:
-        rm = RiskManager(max_orders_per_sec=2, max_cancels_per_sec=8)
-
-        assert rm.can_place_order(current_ms=0) is True
-        assert rm.can_place_order(current_ms=100) is True
-        assert rm.can_place_order(current_ms=200) is False
-
-        # 1000ms 窗口滑过后允许继续
-        assert rm.can_place_order(current_ms=1001) is True
+    @pytest.mark.parametrize(
+        "method, limits, calls",
+        [
+            (
+                "can_place_order",
+                {"max_orders_per_sec": 2, "max_cancels_per_sec": 8},
+                # 1000ms 窗口滑过后允许继续
+                [(0, True), (100, True), (200, False), (1001, True)],
+            ),
+            (
+                "can_cancel_order",
+                {"max_orders_per_sec": 5, "max_cancels_per_sec": 1},
+                [(0, True), (1, False), (1001, True)],
+            ),
+        ],
+        ids=["orders", "cancels"],
+    )
+    def test_rate_limit(self, method: str, limits: dict, calls: list) -> None:
+        rm = RiskManager(**limits)
+        check = getattr(rm, method)
 
-    def test_cancel_rate_limit(self) -> None:
-        rm = RiskManager(max_orders_per_sec=5, max_cancels_per_sec=1)
+        for current_ms, allowed in calls:
+            assert check(current_ms=current_ms) is allowed, current_ms
 
-        assert rm.can_cancel_order(current_ms=0) is True
-        assert rm.can_cancel_order(current_ms=1) is False
-        assert rm.can_cancel_order(current_ms=1001) is True
+    def test_rate_limit_window_slides_across_buffer_wraparound(self) -> None:
+        rm = RiskManager(max_orders_per_sec=3, max_cancels_per_sec=8)
 
+        # 连续多轮填满/滑出窗口，覆盖环形缓冲区回绕
+        assert rm.can_place_order(current_ms=0) is True
+        assert rm.can_place_order(current_ms=400) is True
+        assert rm.can_place_order(current_ms=800) is True
+        assert rm.can_place_order(current_ms=999) is False
+        assert rm.can_place_order(current_ms=1000) is True  # 0 滑出窗口
+        assert rm.can_place_order(current_ms=1200) is False
+        assert rm.can_place_order(current_ms=1400) is True  # 400 滑出窗口
+        assert rm.can_place_order(current_ms=1800) is True  # 800 滑出窗口
+        assert rm.can_place_order(current_ms=1900) is False
+        assert rm.can_place_order(current_ms=3000) is True
+        assert rm.can_place_order(current_ms=3000) is True
+        assert rm.can_place_order(current_ms=3000) is True
+        assert rm.can_place_order(current_ms=3001) is False
@@ -9,8 +9,6 @@
 
 import pytest
 from decimal import Decimal
-from tempfile import TemporaryDirectory
-from pathlib import Path
 
 from src.signal.engine import SignalEngine
 from src.models import (
@@ -21,15 +19,6 @@ from src.models import (
     ExitSignal,
     SignalReason,
 )
-from src.utils.logger import setup_logger
-
-
-@pytest.fixture(autouse=True)
-def setup_logger_for_tests():
-    """每个测试前设置 logger"""
-    with TemporaryDirectory() as tmpdir:
-        setup_logger(Path(tmpdir), console=False)
-        yield
 
 
 class TestSignalEngineInit:
@@ -39,7 +28,7 @@ class TestSignalEngineInit:
         """测试默认初始化"""
         engine = SignalEngine()
         assert engine.min_signal_interval_ms == 200
-        assert len(engine._market_states) == 0
+        assert len(engine._market_data) == 0
         assert len(engine._last_signal_ms) == 0
 
     def test_init_custom_interval(self):
@@ -113,44 +102,101 @@ class TestUpdateMarket:
         engine = SignalEngine()
         symbol = "BTC/USDT:USDT"
 
-        # 发送 book_ticker
+        events = (
+            # book_ticker：只有盘口
+            MarketEvent(
+                symbol=symbol,
+                timestamp_ms=1000,
+                best_bid=Decimal("50000"),
+                best_ask=Decimal("50001"),
+                last_trade_price=None,
+                event_type="book_ticker",
+            ),
+            # 第一个 trade：没有 previous
+            MarketEvent(
+                symbol=symbol,
+                timestamp_ms=1100,
+                best_bid=None,
+                best_ask=None,
+                last_trade_price=Decimal("50000.5"),
+                event_type="agg_trade",
+            ),
+            # 第二个 trade：现在就绪了
+            MarketEvent(
+                symbol=symbol,
+                timestamp_ms=1200,
+                best_bid=None,
+                best_ask=None,
+                last_trade_price=Decimal("50001"),
+                event_type="agg_trade",
+            ),
+        )
+
+        readiness = []
+        for event in events:
+            engine.update_market(event)
+            readiness.append(engine.is_data_ready(symbol))
+        assert readiness == [False, False, True]
+
+    def test_ready_drops_on_zero_price_and_recovers(self):
+        """就绪后收到非正价格时退回未就绪，价格恢复后重新就绪"""
+        engine = SignalEngine()
+        symbol = "BTC/USDT:USDT"
         engine.update_market(MarketEvent(
             symbol=symbol,
             timestamp_ms=1000,
             best_bid=Decimal("50000"),
             best_ask=Decimal("50001"),
-            last_trade_price=None,
             event_type="book_ticker",
         ))
-        assert engine.is_data_ready(symbol) is False
+        for ts, price in ((1100, "50000.5"), (1200, "50001")):
+            engine.update_market(MarketEvent(
+                symbol=symbol,
+                timestamp_ms=ts,
+                last_trade_price=Decimal(price),
+                event_type="agg_trade",
+            ))
+        assert engine.is_data_ready(symbol) is True
 
-        # 发送第一个 trade
         engine.update_market(MarketEvent(
             symbol=symbol,
-            timestamp_ms=1100,
-            best_bid=None,
-            best_ask=None,
-            last_trade_price=Decimal("50000.5"),
-            event_type="agg_trade",
+            timestamp_ms=1300,
+            best_bid=Decimal("50000"),
+            best_ask=Decimal("0"),
+            event_type="book_ticker",
         ))
-        assert engine.is_data_ready(symbol) is False  # 没有 previous
+        assert engine.is_data_ready(symbol) is False
 
-        # 发送第二个 trade
         engine.update_market(MarketEvent(
             symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=None,
-            best_ask=None,
-            last_trade_price=Decimal("50001"),
-            event_type="agg_trade",
+            timestamp_ms=1400,
+            best_bid=Decimal("50000"),
+            best_ask=Decimal("50001"),
+            event_type="book_ticker",
         ))
-        assert engine.is_data_ready(symbol) is True  # 现在就绪了
+        assert engine.is_data_ready(symbol) is True
 
 
 class TestMultipliers:
     """加速/ROI 倍数测试"""
 
-    def test_accel_mult_long(self):
+    @pytest.mark.parametrize(
+        "side, bid, ask, last, amt, top_mult, expected_ret",
+        [
+            # 100 → 102：+2%，命中第二档
+            pytest.param(
+                PositionSide.LONG, Decimal("102"), Decimal("103"), Decimal("102"), Decimal("1"), 4, Decimal("0.02"),
+                id="long",
+            ),
+            # 100 → 98：-2%，SHORT 按跌幅命中第二档
+            pytest.param(
+                PositionSide.SHORT, Decimal("97"), Decimal("98"), Decimal("98"), Decimal("-1"), 5, Decimal("-0.02"),
+                id="short",
+            ),
+        ],
+    )
+    def test_accel_mult(self, side, bid, ask, last, amt, top_mult, expected_ret):
+        """测试加速倍数：窗口涨跌幅命中最高档（SHORT 按跌幅）"""
         engine = SignalEngine()
         symbol = "BTC/USDT:USDT"
         engine.configure_symbol(
@@ -158,15 +204,15 @@ class TestMultipliers:
             accel_window_ms=2000,
             accel_tiers=[
                 (Decimal("0.01"), 2),
-                (Decimal("0.02"), 4),
+                (Decimal("0.02"), top_mult),
             ],
         )
 
         engine.update_market(MarketEvent(
             symbol=symbol,
             timestamp_ms=0,
-            best_bid=Decimal("102"),
-            best_ask=Decimal("103"),
+            best_bid=bid,
+            best_ask=ask,
             event_type="book_ticker",
         ))
         engine.update_market(MarketEvent(
@@ -178,71 +224,160 @@ class TestMultipliers:
         engine.update_market(MarketEvent(
             symbol=symbol,
             timestamp_ms=2000,
-            last_trade_price=Decimal("102"),
+            last_trade_price=last,
             event_type="agg_trade",
         ))
 
         position = Position(
             symbol=symbol,
-            position_side=PositionSide.LONG,
-            position_amt=Decimal("1"),
+            position_side=side,
+            position_amt=amt,
             entry_price=Decimal("100"),
             unrealized_pnl=Decimal("0"),
             leverage=10,
         )
 
-        signal = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=2000)
+        signal = engine.evaluate(symbol, side, position, current_ms=2000)
         assert signal is not None
-        assert signal.accel_mult == 4
-        assert signal.ret_window == Decimal("0.02")
+        assert signal.accel_mult == top_mult
+        assert signal.ret_window == expected_ret
 
-    def test_accel_mult_short(self):
+    def test_trade_history_bounded_by_accel_window(self):
+        """无 evaluate 调用时 trade 历史按长度封顶（window_ms + 1 个点）"""
+        engine = SignalEngine()
+        symbol = "BTC/USDT:USDT"
+        engine.configure_symbol(symbol, accel_window_ms=2000)
+
+        for ts in range(5000):
+            engine.update_market(MarketEvent(
+                symbol=symbol,
+                timestamp_ms=ts,
+                best_bid=None,
+                best_ask=None,
+                last_trade_price=Decimal("50000"),
+                event_type="agg_trade",
+            ))
+
+        history = engine._market_data[symbol].history
+        assert history.maxlen == 2001
+        assert len(history) == 2001
+        assert history[0][0] == 4999 - 2000
+        assert history[-1][0] == 4999
+
+    def test_accel_window_uses_local_clock_when_exchange_clock_ahead(self):
+        """交易所时间戳超前本地时钟时，按本地 current_ms 仍在窗口内的起点不会在写入时被删掉"""
         engine = SignalEngine()
         symbol = "BTC/USDT:USDT"
         engine.configure_symbol(
             symbol,
             accel_window_ms=2000,
-            accel_tiers=[
-                (Decimal("0.01"), 2),
-                (Decimal("0.02"), 5),
-            ],
+            accel_tiers=[(Decimal("0.02"), 4)],
         )
 
         engine.update_market(MarketEvent(
             symbol=symbol,
-            timestamp_ms=0,
-            best_bid=Decimal("97"),
-            best_ask=Decimal("98"),
+            timestamp_ms=1000,
+            best_bid=Decimal("102"),
+            best_ask=Decimal("103"),
             event_type="book_ticker",
         ))
         engine.update_market(MarketEvent(
             symbol=symbol,
-            timestamp_ms=0,
+            timestamp_ms=1000,
             last_trade_price=Decimal("100"),
             event_type="agg_trade",
         ))
+        # 交易所时钟超前 2s：事件时间 4000，本地 current_ms 2500（窗口起点 500 之后的 1000 仍有效）
         engine.update_market(MarketEvent(
             symbol=symbol,
-            timestamp_ms=2000,
-            last_trade_price=Decimal("98"),
+            timestamp_ms=4000,
+            last_trade_price=Decimal("102"),
             event_type="agg_trade",
         ))
 
+        signal = engine.evaluate(symbol, PositionSide.LONG, _position(PositionSide.LONG), current_ms=2500)
+        assert signal is not None
+        assert signal.ret_window == Decimal("0.02")
+        assert signal.accel_mult == 4
+
+    def test_configure_after_market_data_applies_to_existing_symbol(self):
+        """先收到行情再配置：新参数与窗口对已有行情数据生效"""
+        engine = SignalEngine()
+        symbol = "BTC/USDT:USDT"
+        for ts in (0, 500, 1000):
+            engine.update_market(MarketEvent(
+                symbol=symbol,
+                timestamp_ms=ts,
+                last_trade_price=Decimal("50000"),
+                event_type="agg_trade",
+            ))
+
+        engine.configure_symbol(symbol, accel_window_ms=500, min_signal_interval_ms=700)
+
+        data = engine._market_data[symbol]
+        assert data.cfg is engine._symbol_configs[symbol]
+        assert data.cfg.min_signal_interval_ms == 700
+        assert data.history.maxlen == 501
+        assert [ts for ts, _ in data.history] == [0, 500, 1000]
+
+    def test_accel_history_keeps_first_trade_of_same_ms_burst(self):
+        """同毫秒突发成交只保留第一笔作为窗口起点，ret 仍以最新成交价计算"""
+        engine = SignalEngine()
+        symbol = "BTC/USDT:USDT"
+        engine.configure_symbol(symbol, accel_window_ms=2000, accel_tiers=[(Decimal("0.02"), 3)])
+
+        engine.update_market(MarketEvent(
+            symbol=symbol,
+            timestamp_ms=0,
+            best_bid=Decimal("102"),
+            best_ask=Decimal("103"),
+            event_type="book_ticker",
+        ))
+        for price in ("100", "101", "102"):
+            engine.update_market(MarketEvent(
+                symbol=symbol,
+                timestamp_ms=1000,
+                last_trade_price=Decimal(price),
+                event_type="agg_trade",
+            ))
+
+        assert list(engine._market_data[symbol].history) == [(1000, Decimal("100"))]
+
         position = Position(
             symbol=symbol,
-            position_side=PositionSide.SHORT,
-            position_amt=Decimal("-1"),
+            position_side=PositionSide.LONG,
+            position_amt=Decimal("1"),
             entry_price=Decimal("100"),
             unrealized_pnl=Decimal("0"),
             leverage=10,
         )
-
-        signal = engine.evaluate(symbol, PositionSide.SHORT, position, current_ms=2000)
+        signal = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1000)
         assert signal is not None
-        assert signal.accel_mult == 5
-        assert signal.ret_window == Decimal("-0.02")
+        assert signal.ret_window == Decimal("0.02")
+        assert signal.accel_mult == 3
+
+    def test_tiers_precompiled_unsorted_and_clamped(self):
+        """档位在 configure_symbol 时排序并规整 mult（<1 视为 1），取满足条件的最高档"""
+        engine = SignalEngine()
+        symbol = "BTC/USDT:USDT"
+        engine.configure_symbol(
+            symbol,
+            accel_tiers=[(Decimal("0.03"), 2), (Decimal("0.01"), 5), (Decimal("0.02"), 0)],
+            roi_tiers=[(Decimal("0.5"), 3), (Decimal("0.1"), 2)],
+        )
+
+        cfg = engine._symbol_configs[symbol]
+        assert engine._select_accel_mult(cfg, PositionSide.LONG, Decimal("0.005")) == 1
+        assert engine._select_accel_mult(cfg, PositionSide.LONG, Decimal("0.025")) == 5
+        assert engine._select_accel_mult(cfg, PositionSide.LONG, Decimal("0.03")) == 5
+        assert engine._select_accel_mult(cfg, PositionSide.SHORT, Decimal("0.03")) == 1
+        assert engine._select_accel_mult(cfg, PositionSide.SHORT, Decimal("-0.01")) == 5
+        assert engine._select_roi_mult(cfg, Decimal("0.2")) == 2
+        assert engine._select_roi_mult(cfg, Decimal("0.5")) == 3
+        assert engine._select_roi_mult(engine._default_symbol_config, Decimal("0.5")) == 1
 
     def test_roi_mult(self):
+        """测试 ROI 倍数按收益率档位选择"""
         engine = SignalEngine()
         symbol = "BTC/USDT:USDT"
         engine.configure_symbol(
@@ -289,124 +424,104 @@ class TestMultipliers:
         assert signal.roi_mult == 6
 
 
-class TestLongExitConditions:
-    """LONG 平仓条件测试"""
-
-    @pytest.fixture
-    def engine_with_data(self):
-        """创建带数据的引擎"""
-        engine = SignalEngine()
-        symbol = "BTC/USDT:USDT"
-
-        # 设置 book_ticker
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1000,
-            best_bid=Decimal("50000"),
-            best_ask=Decimal("50001"),
-            last_trade_price=None,
-            event_type="book_ticker",
-        ))
-
-        # 设置两个 trade（创建 previous）
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1100,
-            best_bid=None,
-            best_ask=None,
-            last_trade_price=Decimal("49999"),  # previous
-            event_type="agg_trade",
-        ))
-
-        return engine
-
-    def test_long_primary_triggered(self, engine_with_data):
-        """测试 LONG primary 条件触发"""
-        engine = engine_with_data
-        symbol = "BTC/USDT:USDT"
-
-        # last > prev AND best_bid >= last
-        # prev = 49999, 设置 last = 50000, best_bid = 50000
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=Decimal("50000"),
-            best_ask=Decimal("50001"),
-            last_trade_price=None,
-            event_type="book_ticker",
-        ))
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=None,
-            best_ask=None,
-            last_trade_price=Decimal("50000"),  # > prev (49999)
-            event_type="agg_trade",
-        ))
-
-        position = Position(
-            symbol=symbol,
-            position_side=PositionSide.LONG,
-            position_amt=Decimal("0.01"),
-            entry_price=Decimal("49000"),
-            unrealized_pnl=Decimal("10"),
-            leverage=10,
-        )
-
-        signal = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1300)
-
-        assert signal is not None
-        assert signal.reason == SignalReason.LONG_PRIMARY
-
-    def test_long_bid_improve_triggered(self, engine_with_data):
-        """测试 LONG bid_improve 条件触发"""
-        engine = engine_with_data
-        symbol = "BTC/USDT:USDT"
-
-        # best_bid >= last AND best_bid > prev (but NOT last > prev)
-        # prev = 49999, 设置 last = 49998 (下跌), best_bid = 50000 > prev
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=Decimal("50000"),  # > prev (49999)
-            best_ask=Decimal("50001"),
-            last_trade_price=None,
-            event_type="book_ticker",
-        ))
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=None,
-            best_ask=None,
-            last_trade_price=Decimal("49998"),  # < prev, bid >= last
-            event_type="agg_trade",
-        ))
-
-        position = Position(
-            symbol=symbol,
+def _seed_exit_engine(prev_trade: Decimal) -> SignalEngine:
+    """创建带数据的引擎：bookTicker 50000/50001 + 一笔 trade（作为 previous）"""
+    engine = SignalEngine()
+    symbol = "BTC/USDT:USDT"
+    engine.update_market(MarketEvent(
+        symbol=symbol,
+        timestamp_ms=1000,
+        best_bid=Decimal("50000"),
+        best_ask=Decimal("50001"),
+        last_trade_price=None,
+        event_type="book_ticker",
+    ))
+    engine.update_market(MarketEvent(
+        symbol=symbol,
+        timestamp_ms=1100,
+        best_bid=None,
+        best_ask=None,
+        last_trade_price=prev_trade,
+        event_type="agg_trade",
+    ))
+    return engine
+
+
+def _position(side: PositionSide) -> Position:
+    """BTC 标准仓位（LONG 0.01@49000 / SHORT -0.01@51000）；每次调用新建"""
+    if side == PositionSide.LONG:
+        return Position(
+            symbol="BTC/USDT:USDT",
             position_side=PositionSide.LONG,
             position_amt=Decimal("0.01"),
             entry_price=Decimal("49000"),
             unrealized_pnl=Decimal("10"),
             leverage=10,
         )
-
-        signal = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1300)
-
-        assert signal is not None
-        assert signal.reason == SignalReason.LONG_BID_IMPROVE
-
-    def test_long_no_signal(self, engine_with_data):
-        """测试 LONG 无信号"""
-        engine = engine_with_data
+    return Position(
+        symbol="BTC/USDT:USDT",
+        position_side=PositionSide.SHORT,
+        position_amt=Decimal("-0.01"),
+        entry_price=Decimal("51000"),
+        unrealized_pnl=Decimal("10"),
+        leverage=10,
+    )
+
+
+class TestExitConditions:
+    """LONG/SHORT 平仓条件测试（prev → bid/ask → last → 期望信号）"""
+
+    @pytest.mark.parametrize(
+        "side, prev, bid, ask, last, expected",
+        [
+            # last > prev AND best_bid >= last
+            pytest.param(
+                PositionSide.LONG, Decimal("49999"),
+                Decimal("50000"), Decimal("50001"), Decimal("50000"), SignalReason.LONG_PRIMARY,
+                id="long_primary",
+            ),
+            # best_bid >= last AND best_bid > prev（last 下跌，不满足 primary）
+            pytest.param(
+                PositionSide.LONG, Decimal("49999"),
+                Decimal("50000"), Decimal("50001"), Decimal("49998"), SignalReason.LONG_BID_IMPROVE,
+                id="long_bid_improve",
+            ),
+            # 价格下跌且 bid 也低
+            pytest.param(
+                PositionSide.LONG, Decimal("49999"),
+                Decimal("49997"), Decimal("49998"), Decimal("49998"), None,
+                id="long_no_signal",
+            ),
+            # last < prev AND best_ask <= last
+            pytest.param(
+                PositionSide.SHORT, Decimal("50001"),
+                Decimal("49999"), Decimal("50000"), Decimal("50000"), SignalReason.SHORT_PRIMARY,
+                id="short_primary",
+            ),
+            # best_ask <= last AND best_ask < prev（last 上涨，不满足 primary）
+            pytest.param(
+                PositionSide.SHORT, Decimal("50001"),
+                Decimal("49999"), Decimal("50000"), Decimal("50002"), SignalReason.SHORT_ASK_IMPROVE,
+                id="short_ask_improve",
+            ),
+            # 价格上涨且 ask 也高
+            pytest.param(
+                PositionSide.SHORT, Decimal("50001"),
+                Decimal("50002"), Decimal("50003"), Decimal("50002"), None,
+                id="short_no_signal",
+            ),
+        ],
+    )
+    def test_exit_condition(self, side, prev, bid, ask, last, expected):
+        """测试 LONG/SHORT 平仓条件触发与不触发"""
+        engine = _seed_exit_engine(prev)
         symbol = "BTC/USDT:USDT"
 
-        # 价格下跌且 bid 也低
         engine.update_market(MarketEvent(
             symbol=symbol,
             timestamp_ms=1200,
-            best_bid=Decimal("49997"),
-            best_ask=Decimal("49998"),
+            best_bid=bid,
+            best_ask=ask,
             last_trade_price=None,
             event_type="book_ticker",
         ))
@@ -415,172 +530,102 @@ class TestLongExitConditions:
             timestamp_ms=1200,
             best_bid=None,
             best_ask=None,
-            last_trade_price=Decimal("49998"),
+            last_trade_price=last,
             event_type="agg_trade",
         ))
 
-        position = Position(
-            symbol=symbol,
-            position_side=PositionSide.LONG,
-            position_amt=Decimal("0.01"),
-            entry_price=Decimal("49000"),
-            unrealized_pnl=Decimal("10"),
-            leverage=10,
-        )
+        signal = engine.evaluate(symbol, side, _position(side), current_ms=1300)
 
-        signal = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1300)
+        if expected is None:
+            assert signal is None
+        else:
+            assert signal is not None
+            assert signal.reason == expected
 
-        assert signal is None
-
-
-class TestShortExitConditions:
-    """SHORT 平仓条件测试"""
-
-    @pytest.fixture
-    def engine_with_data(self):
-        """创建带数据的引擎"""
+    def test_exit_checks_without_previous_trade_return_none(self):
+        """没有 previous 成交价时 LONG/SHORT 条件判断直接返回 None（不依赖调用方的就绪检查）"""
         engine = SignalEngine()
-        symbol = "BTC/USDT:USDT"
-
-        # 设置 book_ticker
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1000,
+        state = MarketState(
+            symbol="BTC/USDT:USDT",
             best_bid=Decimal("50000"),
-            best_ask=Decimal("50001"),
-            last_trade_price=None,
-            event_type="book_ticker",
-        ))
-
-        # 设置两个 trade（创建 previous）
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1100,
-            best_bid=None,
-            best_ask=None,
-            last_trade_price=Decimal("50001"),  # previous
-            event_type="agg_trade",
-        ))
+            best_ask=Decimal("50000"),
+            last_trade_price=Decimal("50000"),
+        )
 
-        return engine
+        assert engine._check_long_exit(state) is None
+        assert engine._check_short_exit(state) is None
 
-    def test_short_primary_triggered(self, engine_with_data):
-        """测试 SHORT primary 条件触发"""
-        engine = engine_with_data
+    def test_long_no_signal_cached_until_market_changes(self, monkeypatch):
+        """无信号且价格未变化时跳过条件判断；新行情到达后重新判断"""
+        engine = _seed_exit_engine(Decimal("49999"))
         symbol = "BTC/USDT:USDT"
-
-        # last < prev AND best_ask <= last
-        # prev = 50001, 设置 last = 50000, best_ask = 50000
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=Decimal("49999"),
-            best_ask=Decimal("50000"),  # <= last
-            last_trade_price=None,
-            event_type="book_ticker",
-        ))
         engine.update_market(MarketEvent(
             symbol=symbol,
             timestamp_ms=1200,
             best_bid=None,
             best_ask=None,
-            last_trade_price=Decimal("50000"),  # < prev (50001)
+            last_trade_price=Decimal("50002"),
             event_type="agg_trade",
         ))
+        position = _position(PositionSide.LONG)
 
-        position = Position(
-            symbol=symbol,
-            position_side=PositionSide.SHORT,
-            position_amt=Decimal("-0.01"),
-            entry_price=Decimal("51000"),
-            unrealized_pnl=Decimal("10"),
-            leverage=10,
-        )
+        calls = []
+        original = engine._check_long_exit
 
-        signal = engine.evaluate(symbol, PositionSide.SHORT, position, current_ms=1300)
+        def counting_check(state):
+            calls.append(state.best_bid)
+            return original(state)
 
-        assert signal is not None
-        assert signal.reason == SignalReason.SHORT_PRIMARY
+        monkeypatch.setattr(engine, "_check_long_exit", counting_check)
 
-    def test_short_ask_improve_triggered(self, engine_with_data):
-        """测试 SHORT ask_improve 条件触发"""
-        engine = engine_with_data
-        symbol = "BTC/USDT:USDT"
+        # bid 50000 < last 50002：无信号
+        assert engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1300) is None
+        assert engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1400) is None
+        assert len(calls) == 1
 
-        # best_ask <= last AND best_ask < prev (but NOT last < prev)
-        # prev = 50001, 设置 last = 50002 (上涨，不满足 primary), best_ask = 50000 < prev
+        # markPrice 不影响退出条件，不使缓存失效
         engine.update_market(MarketEvent(
             symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=Decimal("49999"),
-            best_ask=Decimal("50000"),  # < prev (50001)
-            last_trade_price=None,
-            event_type="book_ticker",
+            timestamp_ms=1450,
+            mark_price=Decimal("50001"),
+            event_type="mark_price",
         ))
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=None,
-            best_ask=None,
-            last_trade_price=Decimal("50002"),  # > prev, 不满足 primary (last < prev)
-            event_type="agg_trade",
-        ))
-
-        # 此时 last=50002, prev=50001, best_ask=50000
-        # short_primary: last < prev? 50002 < 50001? NO
-        # short_ask_improve: best_ask <= last? 50000 <= 50002? YES
-        #                    best_ask < prev? 50000 < 50001? YES
-        # 所以应该触发 ask_improve
-
-        position = Position(
-            symbol=symbol,
-            position_side=PositionSide.SHORT,
-            position_amt=Decimal("-0.01"),
-            entry_price=Decimal("51000"),
-            unrealized_pnl=Decimal("10"),
-            leverage=10,
-        )
-
-        signal = engine.evaluate(symbol, PositionSide.SHORT, position, current_ms=1300)
-
-        assert signal is not None
-        assert signal.reason == SignalReason.SHORT_ASK_IMPROVE
+        assert engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1500) is None
+        assert len(calls) == 1
 
-    def test_short_no_signal(self, engine_with_data):
-        """测试 SHORT 无信号"""
-        engine = engine_with_data
-        symbol = "BTC/USDT:USDT"
-
-        # 价格上涨且 ask 也高
+        # 买一抬升到 last 之上：触发 LONG primary
         engine.update_market(MarketEvent(
             symbol=symbol,
-            timestamp_ms=1200,
+            timestamp_ms=1600,
             best_bid=Decimal("50002"),
-            best_ask=Decimal("50003"),  # > prev
-            last_trade_price=None,
+            best_ask=Decimal("50003"),
             event_type="book_ticker",
         ))
-        engine.update_market(MarketEvent(
-            symbol=symbol,
-            timestamp_ms=1200,
-            best_bid=None,
-            best_ask=None,
-            last_trade_price=Decimal("50002"),  # > prev
-            event_type="agg_trade",
-        ))
-
-        position = Position(
-            symbol=symbol,
-            position_side=PositionSide.SHORT,
-            position_amt=Decimal("-0.01"),
-            entry_price=Decimal("51000"),
-            unrealized_pnl=Decimal("10"),
-            leverage=10,
-        )
+        signal = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1700)
+        assert signal is not None
+        assert signal.reason == SignalReason.LONG_PRIMARY
+        assert len(calls) == 2
 
-        signal = engine.evaluate(symbol, PositionSide.SHORT, position, current_ms=1300)
 
-        assert signal is None
+def _throttle_seed_events() -> tuple[MarketEvent, ...]:
+    """节流测试共用的行情序列（每次调用新建）：bookTicker 50000/50001 + trade 49999 → 50000，满足 LONG 平仓条件"""
+    return (
+        MarketEvent(
+            symbol="BTC/USDT:USDT", timestamp_ms=1000,
+            best_bid=Decimal("50000"), best_ask=Decimal("50001"),
+            last_trade_price=None, event_type="book_ticker",
+        ),
+        MarketEvent(
+            symbol="BTC/USDT:USDT", timestamp_ms=1100,
+            best_bid=None, best_ask=None,
+            last_trade_price=Decimal("49999"), event_type="agg_trade",
+        ),
+        MarketEvent(
+            symbol="BTC/USDT:USDT", timestamp_ms=1200,
+            best_bid=None, best_ask=None,
+            last_trade_price=Decimal("50000"), event_type="agg_trade",
+        ),
+    )
 
 
 class TestThrottling:
@@ -592,27 +637,10 @@ class TestThrottling:
         symbol = "BTC/USDT:USDT"
 
         # 设置数据
-        engine.update_market(MarketEvent(
-            symbol=symbol, timestamp_ms=1000,
-            best_bid=Decimal("50000"), best_ask=Decimal("50001"),
-            last_trade_price=None, event_type="book_ticker",
-        ))
-        engine.update_market(MarketEvent(
-            symbol=symbol, timestamp_ms=1100,
-            best_bid=None, best_ask=None,
-            last_trade_price=Decimal("49999"), event_type="agg_trade",
-        ))
-        engine.update_market(MarketEvent(
-            symbol=symbol, timestamp_ms=1200,
-            best_bid=None, best_ask=None,
-            last_trade_price=Decimal("50000"), event_type="agg_trade",
-        ))
+        for event in _throttle_seed_events():
+            engine.update_market(event)
 
-        position = Position(
-            symbol=symbol, position_side=PositionSide.LONG,
-            position_amt=Decimal("0.01"), entry_price=Decimal("49000"),
-            unrealized_pnl=Decimal("10"), leverage=10,
-        )
+        position = _position(PositionSide.LONG)
 
         # 第一次信号
         signal1 = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1300)
@@ -626,6 +654,40 @@ class TestThrottling:
         signal3 = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1500)
         assert signal3 is not None  # 不被节流
 
+    def test_throttle_uses_symbol_interval_override(self):
+        """测试 per-symbol 节流间隔覆盖；只配置档位时沿用引擎默认间隔"""
+        engine = SignalEngine(min_signal_interval_ms=200)
+        engine.configure_symbol("BTC/USDT:USDT", min_signal_interval_ms=500)
+        engine.configure_symbol("ETH/USDT:USDT", roi_tiers=[(Decimal("0.1"), 2)])
+
+        for symbol in ("BTC/USDT:USDT", "ETH/USDT:USDT"):
+            engine.update_market(MarketEvent(
+                symbol=symbol, timestamp_ms=1000,
+                best_bid=Decimal("50000"), best_ask=Decimal("50001"),
+                last_trade_price=None, event_type="book_ticker",
+            ))
+            for ts, price in ((1100, "49999"), (1200, "50000")):
+                engine.update_market(MarketEvent(
+                    symbol=symbol, timestamp_ms=ts,
+                    best_bid=None, best_ask=None,
+                    last_trade_price=Decimal(price), event_type="agg_trade",
+                ))
+
+        def evaluate(symbol: str, current_ms: int):
+            position = Position(
+                symbol=symbol, position_side=PositionSide.LONG,
+                position_amt=Decimal("0.01"), entry_price=Decimal("49000"),
+                unrealized_pnl=Decimal("10"), leverage=10,
+            )
+            return engine.evaluate(symbol, PositionSide.LONG, position, current_ms=current_ms)
+
+        assert evaluate("BTC/USDT:USDT", 1300) is not None
+        assert evaluate("BTC/USDT:USDT", 1600) is None
+        assert evaluate("BTC/USDT:USDT", 1800) is not None
+
+        assert evaluate("ETH/USDT:USDT", 1300) is not None
+        assert evaluate("ETH/USDT:USDT", 1500) is not None
+
     def test_throttle_independent_per_side(self):
         """测试 LONG/SHORT 节流独立"""
         engine = SignalEngine(min_signal_interval_ms=200)
@@ -648,16 +710,8 @@ class TestThrottling:
             last_trade_price=Decimal("50000"), event_type="agg_trade",
         ))
 
-        long_position = Position(
-            symbol=symbol, position_side=PositionSide.LONG,
-            position_amt=Decimal("0.01"), entry_price=Decimal("49000"),
-            unrealized_pnl=Decimal("10"), leverage=10,
-        )
-        short_position = Position(
-            symbol=symbol, position_side=PositionSide.SHORT,
-            position_amt=Decimal("-0.01"), entry_price=Decimal("51000"),
-            unrealized_pnl=Decimal("10"), leverage=10,
-        )
+        long_position = _position(PositionSide.LONG)
+        short_position = _position(PositionSide.SHORT)
 
         # LONG 信号
         signal_long = engine.evaluate(symbol, PositionSide.LONG, long_position, current_ms=1300)
@@ -676,27 +730,10 @@ class TestThrottling:
         symbol = "BTC/USDT:USDT"
 
         # 设置数据
-        engine.update_market(MarketEvent(
-            symbol=symbol, timestamp_ms=1000,
-            best_bid=Decimal("50000"), best_ask=Decimal("50001"),
-            last_trade_price=None, event_type="book_ticker",
-        ))
-        engine.update_market(MarketEvent(
-            symbol=symbol, timestamp_ms=1100,
-            best_bid=None, best_ask=None,
-            last_trade_price=Decimal("49999"), event_type="agg_trade",
-        ))
-        engine.update_market(MarketEvent(
-            symbol=symbol, timestamp_ms=1200,
-            best_bid=None, best_ask=None,
-            last_trade_price=Decimal("50000"), event_type="agg_trade",
-        ))
+        for event in _throttle_seed_events():
+            engine.update_market(event)
 
-        position = Position(
-            symbol=symbol, position_side=PositionSide.LONG,
-            position_amt=Decimal("0.01"), entry_price=Decimal("49000"),
-            unrealized_pnl=Decimal("10"), leverage=10,
-        )
+        position = _position(PositionSide.LONG)
 
         # 第一次信号
         signal1 = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1300)
@@ -749,14 +786,7 @@ class TestEdgeCases:
         """测试无状态时无信号"""
         engine = SignalEngine()
 
-        position = Position(
-            symbol="BTC/USDT:USDT",
-            position_side=PositionSide.LONG,
-            position_amt=Decimal("0.01"),
-            entry_price=Decimal("49000"),
-            unrealized_pnl=Decimal("10"),
-            leverage=10,
-        )
+        position = _position(PositionSide.LONG)
 
         signal = engine.evaluate("BTC/USDT:USDT", PositionSide.LONG, position, current_ms=1000)
         assert signal is None
@@ -807,11 +837,7 @@ class TestSignalContent:
             last_trade_price=Decimal("50000"), event_type="agg_trade",
         ))
 
-        position = Position(
-            symbol=symbol, position_side=PositionSide.LONG,
-            position_amt=Decimal("0.01"), entry_price=Decimal("49000"),
-            unrealized_pnl=Decimal("10"), leverage=10,
-        )
+        position = _position(PositionSide.LONG)
 
         signal = engine.evaluate(symbol, PositionSide.LONG, position, current_ms=1300)
 
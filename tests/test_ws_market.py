@@ -10,21 +10,10 @@
 import pytest
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
-from tempfile import TemporaryDirectory
-from pathlib import Path
 from typing import List
 
 from src.ws.market import MarketWSClient, WS_BASE_URL
 from src.models import MarketEvent
-from src.utils.logger import setup_logger
-
-
-@pytest.fixture(autouse=True)
-def setup_logger_for_tests():
-    """每个测试前设置 logger"""
-    with TemporaryDirectory() as tmpdir:
-        setup_logger(Path(tmpdir), console=False)
-        yield
 
 
 class TestMarketWSClientInit:
@@ -12,8 +12,6 @@ import aiohttp
 import pytest
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
-from tempfile import TemporaryDirectory
-from pathlib import Path
 from typing import List
 
 from src.ws.user_data import (
@@ -25,15 +23,6 @@ from src.ws.user_data import (
     KEEPALIVE_INTERVAL_MS,
 )
 from src.models import AlgoOrderUpdate, OrderUpdate, OrderSide, PositionSide, OrderStatus, PositionUpdate, LeverageUpdate
-from src.utils.logger import setup_logger
-
-
-@pytest.fixture(autouse=True)
-def setup_logger_for_tests():
-    """每个测试前设置 logger"""
-    with TemporaryDirectory() as tmpdir:
-        setup_logger(Path(tmpdir), console=False)
-        yield
 
 
 class TestUserDataWSClientInit: